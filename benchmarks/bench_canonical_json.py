@@ -0,0 +1,67 @@
+# Micro-benchmark: canonical JSON encoding used by the strict_eq helpers
+#
+# Compares the previous encoding
+#     json.dumps(result, sort_keys=True)
+# with canonical_dumps from nondet.py (same, with compact separators). The
+# string is what validators compare and what gets stored, so the byte count
+# is the saving; serialization time is reported to show it does not change. Parsing
+# after consensus is plain json.loads in both cases and is not measured.
+#
+# Run with: python benchmarks/bench_canonical_json.py
+#
+# nondet.py imports genlayer, which only exists inside GenVM, so the
+# function is loaded from its source instead of imported.
+
+import ast
+import json
+import os
+import timeit
+
+NONDET = os.path.join(os.path.dirname(__file__), "..", "src", "genlayer_utils", "nondet.py")
+WANTED = {"canonical_dumps"}
+
+
+def load_canonical_helpers() -> dict:
+    with open(NONDET, "r", encoding="utf-8") as f:
+        tree = ast.parse(f.read())
+    nodes = [node for node in tree.body if isinstance(node, ast.FunctionDef) and node.name in WANTED]
+    namespace = {"json": json}
+    exec(compile(ast.Module(body=nodes, type_ignores=[]), NONDET, "exec"), namespace)
+    return namespace
+
+
+def make_result(n: int) -> dict:
+    return {
+        "items": [
+            {"id": i, "name": f"item-{i}", "price": f"{i * 1.5:.2f}", "tags": ["a", "b", "c"]}
+            for i in range(n)
+        ],
+        "source": "https://example.com/market",
+        "verdict": "true",
+    }
+
+
+def old_dumps(result) -> str:
+    return json.dumps(result, sort_keys=True)
+
+
+def main() -> None:
+    dumps = load_canonical_helpers()["canonical_dumps"]
+
+    print(f"{'entries':>8} {'old bytes':>10} {'new bytes':>10} {'saved':>7} {'old us':>10} {'new us':>10} {'speedup':>8}")
+    for n in (10, 100, 1000, 5000):
+        result = make_result(n)
+        number = max(5, 20000 // n)
+        old = min(timeit.repeat(lambda: old_dumps(result), number=number, repeat=5)) / number
+        new = min(timeit.repeat(lambda: dumps(result), number=number, repeat=5)) / number
+        old_size = len(old_dumps(result))
+        new_size = len(dumps(result))
+        saved = 1 - new_size / old_size
+        print(
+            f"{n:>8} {old_size:>10} {new_size:>10} {saved:>6.0%} "
+            f"{old * 1e6:>10.1f} {new * 1e6:>10.1f} {old / new:>7.2f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -7,6 +7,8 @@
 # spam, hate speech, or misinformation. Demonstrates role-based access
 # and LLM classification templates.
 
+import datetime
+import hashlib
 import json
 from dataclasses import dataclass
 from genlayer import *
@@ -18,7 +20,7 @@ def llm_strict(prompt, *, response_format="json"):
     def _inner():
         result = gl.nondet.exec_prompt(prompt, response_format=response_format)
         if isinstance(result, dict):
-            return json.dumps(result, sort_keys=True)
+            return json.dumps(result, sort_keys=True, separators=(",", ":"))
         return result
     raw = gl.eq_principle.strict_eq(_inner)
     if response_format == "json":
@@ -26,6 +28,41 @@ def llm_strict(prompt, *, response_format="json"):
     return raw
 
 
+@allow_storage
+@dataclass
+class ClassificationMemo:
+    entries: TreeMap[str, str]
+    ring: DynArray[str]
+    next_slot: u256
+    hits: u256
+    misses: u256
+
+
+def classification_key(text, template, categories):
+    normalized = " ".join(text.casefold().split())
+    payload = "\x00".join([normalized, template, "|".join(sorted(categories))])
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def memo_classify(memo, text, template, categories, classify_fn, *, capacity=1024):
+    key = classification_key(text, template, categories)
+    if key in memo.entries:
+        memo.hits += 1
+        return json.loads(memo.entries[key])
+    memo.misses += 1
+    result = classify_fn()
+    if len(memo.ring) < capacity:
+        memo.ring.append(key)
+    else:
+        slot = memo.next_slot % len(memo.ring)
+        evicted = memo.ring[slot]
+        if evicted in memo.entries:
+            del memo.entries[evicted]
+        memo.ring[slot] = key
+        memo.next_slot = (slot + 1) % len(memo.ring)
+    memo.entries[key] = json.dumps(result, sort_keys=True, separators=(",", ":"))
+    return result
+
 # ─── genlayer-utils: llm ────────────────────────────────────────────────────
 
 def classify_prompt(text, categories, context=""):
@@ -45,16 +82,120 @@ Rules:
 - Your response must be valid JSON only, no extra text"""
 
 
+def validate_enum_field(result, field, allowed):
+    return result.get(field) in allowed
+
+
+# ─── genlayer-utils: access_control ─────────────────────────────────────────
+
+def require_rate_limit(buckets, method, capacity, refill_seconds, *, cost=1):
+    key = f"{method}:{gl.message.sender_address.as_hex}"
+    now = _message_timestamp()
+    tokens, last = _refill_bucket(buckets.get(key, None), now, capacity, refill_seconds)
+    if tokens < cost:
+        wait = last + refill_seconds * (cost - tokens) - now
+        raise Exception(f"Rate limited: {method} available again in {wait}s")
+    buckets[key] = ((tokens - cost) << 64) | last
+
+
+def _refill_bucket(packed, now, capacity, refill_seconds):
+    if packed is None:
+        return capacity, now
+    tokens, last = packed >> 64, packed & ((1 << 64) - 1)
+    refilled = max(0, now - last) // refill_seconds
+    if tokens + refilled >= capacity:
+        return capacity, now
+    return tokens + refilled, last + refilled * refill_seconds
+
+
+def _message_timestamp():
+    raw = gl.message_raw["datetime"].replace("Z", "+00:00")
+    return int(datetime.datetime.fromisoformat(raw).timestamp())
+
+
 # ─── genlayer-utils: storage ────────────────────────────────────────────────
 
-def increment_or_init(data, key, amount=1):
-    current = data.get(key, 0)
-    data[key] = current + amount
+@allow_storage
+@dataclass
+class GroupAggregate:
+    count: u256
+    total: u256
+    min: u256
+    max: u256
+
+
+def aggregate_add(aggregates, group, value=0):
+    if group not in aggregates:
+        aggregates[group] = GroupAggregate(count=1, total=value, min=value, max=value)
+        return
+    agg = aggregates[group]
+    agg.count += 1
+    agg.total += value
+    if value < agg.min:
+        agg.min = value
+    if value > agg.max:
+        agg.max = value
+
+
+def aggregate_remove(aggregates, group, value=0):
+    if group not in aggregates:
+        return
+    agg = aggregates[group]
+    if agg.count <= 1:
+        del aggregates[group]
+        return
+    agg.count -= 1
+    agg.total -= value
+
+
+def view_cache_store(cache, name, value):
+    cache[name] = json.dumps(value, sort_keys=True, separators=(",", ":"))
+
+
+def view_cache_read(cache, name, build):
+    if name in cache:
+        return cache[name]
+    return json.dumps(build(), sort_keys=True, separators=(",", ":"))
+
+
+def index_add(index, field, value, key):
+    index.get_or_insert_default(f"{field}={value}")[key] = True
+
+
+def index_discard(index, field, value, key):
+    bucket = f"{field}={value}"
+    if bucket in index and key in index[bucket]:
+        del index[bucket][key]
+
+
+def index_move(index, field, old_value, new_value, key):
+    if old_value == new_value:
+        return
+    index_discard(index, field, old_value, key)
+    index_add(index, field, new_value, key)
+
+
+def index_lookup(index, field, value, offset=0, limit=100):
+    bucket = f"{field}={value}"
+    if bucket not in index:
+        return []
+    keys = []
+    count = 0
+    for k in index[bucket]:
+        if count < offset:
+            count += 1
+            continue
+        if len(keys) >= limit:
+            break
+        keys.append(k)
+        count += 1
+    return keys
 
 
 # ─── Contract ───────────────────────────────────────────────────────────────
 
 CATEGORIES = ["safe", "spam", "hate_speech", "misinformation"]
+CONTEXT = "You are a content moderator for a decentralized platform."
 
 @allow_storage
 @dataclass
@@ -71,11 +212,16 @@ class Post:
 class ContentModerator(gl.Contract):
     posts: TreeMap[str, Post]
     post_count: u256
-    flagged_count: TreeMap[str, u256]  # category -> count
+    _category_stats: TreeMap[str, GroupAggregate]  # category -> moderated post count
+    _post_index: TreeMap[str, TreeMap[str, bool]]  # "category=<c>" -> post ids
+    _views: TreeMap[str, str]  # view name -> pre-serialized result
     _roles: TreeMap[str, TreeMap[Address, bool]]
+    _verdict_memo: ClassificationMemo  # bounded cache of verdicts for reposted text
+    _rate_limits: TreeMap[str, u256]  # "<method>:<address>" -> packed token bucket
 
     def __init__(self):
         self.post_count = 0
+        view_cache_store(self._views, "stats", {})
         # Grant deployer admin role
         self._roles.get_or_insert_default("admin")[gl.message.sender_address] = True
 
@@ -97,6 +243,7 @@ class ContentModerator(gl.Contract):
     @gl.public.write
     def submit_post(self, content: str) -> None:
         """Submit content for moderation."""
+        require_rate_limit(self._rate_limits, "submit_post", capacity=10, refill_seconds=60)
         self.post_count += 1
         post_id = f"post_{self.post_count}"
 
@@ -109,10 +256,12 @@ class ContentModerator(gl.Contract):
             reason="",
             is_moderated=False,
         )
+        index_add(self._post_index, "category", "pending", post_id)
 
     @gl.public.write
     def moderate(self, post_id: str) -> None:
         """Run AI classification on a post. Anyone can trigger moderation."""
+        require_rate_limit(self._rate_limits, "moderate", capacity=5, refill_seconds=120)
         if post_id not in self.posts:
             raise Exception("Post not found")
 
@@ -120,22 +269,34 @@ class ContentModerator(gl.Contract):
         if post.is_moderated:
             raise Exception("Post already moderated")
 
-        # genlayer-utils: classify with one function call
-        prompt = classify_prompt(
-            text=post.content,
-            categories=CATEGORIES,
-            context="You are a content moderator for a decentralized platform.",
+        # genlayer-utils: classify with one function call; identical text
+        # that was already classified is answered from storage
+        result = memo_classify(
+            self._verdict_memo,
+            post.content,
+            classify_prompt("{text}", CATEGORIES, context=CONTEXT),
+            CATEGORIES,
+            lambda: self._classify(post.content),
         )
-        result = llm_strict(prompt)
 
         post.category = result["category"]
+        index_move(self._post_index, "category", "pending", post.category, post_id)
         post.confidence = result.get("confidence", "unknown")
         post.reason = result.get("reason", "")
         post.is_moderated = True
 
         # Track flagged content counts
+        aggregate_add(self._category_stats, post.category)
         if post.category != "safe":
-            increment_or_init(self.flagged_count, post.category)
+            view_cache_store(self._views, "stats", self._build_stats())
+
+    def _classify(self, content: str) -> dict:
+        # Validate before memo_classify stores the verdict, so an off-list
+        # category is neither cached nor counted
+        result = llm_strict(classify_prompt(content, CATEGORIES, context=CONTEXT))
+        if not validate_enum_field(result, "category", CATEGORIES):
+            raise Exception(f"Invalid category: {result.get('category')}")
+        return result
 
     @gl.public.write
     def add_moderator(self, account: Address) -> None:
@@ -152,6 +313,12 @@ class ContentModerator(gl.Contract):
             raise Exception("Only moderators or admins can remove posts")
 
         if post_id in self.posts:
+            post = self.posts[post_id]
+            index_discard(self._post_index, "category", post.category, post_id)
+            if post.is_moderated:
+                aggregate_remove(self._category_stats, post.category)
+                if post.category != "safe":
+                    view_cache_store(self._views, "stats", self._build_stats())
             del self.posts[post_id]
 
     @gl.public.view
@@ -173,8 +340,34 @@ class ContentModerator(gl.Contract):
         ]
 
     @gl.public.view
-    def get_stats(self) -> dict:
+    def get_posts_by_category(self, category: str, offset: int = 0, limit: int = 100) -> list:
+        """List posts in one category (e.g. "hate_speech" or "pending") via the index."""
+        post_ids = index_lookup(self._post_index, "category", category, offset, limit)
+        return [
+            {"id": p.id, "category": p.category, "is_moderated": p.is_moderated}
+            for p in (self.posts[post_id] for post_id in post_ids)
+        ]
+
+    def _build_stats(self) -> dict:
+        # One aggregate lookup per flagged category; no scan over posts
         stats = {}
-        for cat, count in self.flagged_count.items():
-            stats[cat] = count
+        for cat in CATEGORIES:
+            if cat != "safe" and cat in self._category_stats:
+                stats[cat] = self._category_stats[cat].count
         return stats
+
+    @gl.public.view
+    def get_stats(self) -> dict:
+        """Flagged counts per category, from the snapshot kept by the writes."""
+        return json.loads(view_cache_read(self._views, "stats", self._build_stats))
+
+    @gl.public.view
+    def get_memo_stats(self) -> dict:
+        """Classification memo hits, misses and size."""
+        m = self._verdict_memo
+        return {"hits": m.hits, "misses": m.misses, "size": len(m.ring)}
+
+    @gl.public.view
+    def get_stats_json(self) -> str:
+        """Flagged counts as JSON, serialized when they last changed."""
+        return view_cache_read(self._views, "stats", self._build_stats)
@@ -17,3 +17,13 @@ class EventExample(gl.Contract):
     @gl.public.view
     def get_events(self, name: str, offset: int = 0, limit: int = 100) -> list:
         return query_indexed_events(self._events, name, offset=offset, limit=limit)
+
+    @gl.public.view
+    def get_events_since(self, name: str, cursor: int = 0, limit: int = 100) -> dict:
+        # Poll with the returned next_cursor; each call only returns new events
+        return query_events_since(self._events, name, cursor, limit)
+
+    @gl.public.view
+    def get_recent_events(self, name: str, cursor: int | None = None, limit: int = 20) -> dict:
+        # Newest first; pass next_cursor back in to page towards older events
+        return query_events_before(self._events, name, cursor, limit)
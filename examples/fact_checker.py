@@ -1,11 +1,12 @@
 # { "Depends": "py-genlayer:test" }
 #
 # Fact Checker — Example GenLayer Intelligent Contract
-# Uses: nondet, llm, access_control, storage helpers from genlayer-utils
+# Uses: nondet, llm, web_oracle, access_control, storage helpers from genlayer-utils
 #
 # A simplified fact-checking contract where users submit claims,
 # and AI verifies them against web sources.
 
+import datetime
 import json
 from dataclasses import dataclass
 from genlayer import *
@@ -19,7 +20,7 @@ def web_llm_strict(url, prompt_template, *, mode="text", response_format="json")
         filled_prompt = prompt_template.format(web_data=web_data)
         result = gl.nondet.exec_prompt(filled_prompt, response_format=response_format)
         if isinstance(result, dict):
-            return json.dumps(result, sort_keys=True)
+            return json.dumps(result, sort_keys=True, separators=(",", ":"))
         return result
     raw = gl.eq_principle.strict_eq(_inner)
     if response_format == "json":
@@ -50,6 +51,71 @@ Rules:
 - Your response must be valid JSON only, no extra text"""
 
 
+def fact_check_batch_prompt(claims, evidence, verdicts=None):
+    if verdicts is None:
+        verdicts = ["true", "false", "partially_true"]
+    v = "|".join(verdicts)
+    numbered = "\n".join(f"{i}. {claim}" for i, claim in enumerate(claims, start=1))
+    return f"""You are a fact-checker. Based on the evidence provided,
+determine for each numbered claim whether it is {" or ".join(verdicts)}.
+
+CLAIMS:
+{numbered}
+
+EVIDENCE:
+{evidence}
+
+Respond ONLY with this exact JSON format, nothing else:
+{{"results": [{{"claim": <claim number>, "verdict": "<{v}>", "explanation": "<brief 1 sentence explanation>"}}]}}
+
+Rules:
+- Include exactly one result per claim, in the same order as the claims
+- Base each verdict strictly on the provided evidence
+- Keep each explanation concise and factual
+- Your response must be valid JSON only, no extra text"""
+
+
+def validate_batch_verdicts(result, count, allowed):
+    results = result.get("results")
+    if not isinstance(results, list) or len(results) != count:
+        return False
+    for i, item in enumerate(results, start=1):
+        if not isinstance(item, dict) or item.get("claim") != i:
+            return False
+        if item.get("verdict") not in allowed:
+            return False
+    return True
+
+
+# ─── genlayer-utils: web_oracle ─────────────────────────────────────────────
+
+def fact_check_batch(url, claims, *, verdicts=None, mode="text"):
+    if verdicts is None:
+        verdicts = ["true", "false", "partially_true"]
+
+    def _judge():
+        web_data = gl.nondet.web.render(url, mode=mode)
+        prompt = fact_check_batch_prompt(claims, web_data, verdicts)
+        result = gl.nondet.exec_prompt(prompt, response_format="json")
+        if not validate_batch_verdicts(result, len(claims), verdicts):
+            raise Exception("LLM response does not cover every claim with a valid verdict")
+        return [
+            {"verdict": item["verdict"], "explanation": item.get("explanation", "")}
+            for item in result["results"]
+        ]
+
+    def _leader():
+        return json.dumps(_judge(), sort_keys=True, separators=(",", ":"))
+
+    def _validator(leader_result):
+        if not isinstance(leader_result, gl.vm.Return):
+            return False
+        leader_verdicts = [item["verdict"] for item in json.loads(leader_result.calldata)]
+        return leader_verdicts == [item["verdict"] for item in _judge()]
+
+    return json.loads(gl.vm.run_nondet(_leader, _validator))
+
+
 # ─── genlayer-utils: access_control ─────────────────────────────────────────
 
 def require_sender(expected):
@@ -57,19 +123,110 @@ def require_sender(expected):
         raise Exception("Unauthorized: caller is not the expected address")
 
 
-# ─── genlayer-utils: storage ────────────────────────────────────────────────
+def require_rate_limit(buckets, method, capacity, refill_seconds, *, cost=1):
+    key = f"{method}:{gl.message.sender_address.as_hex}"
+    now = _message_timestamp()
+    tokens, last = _refill_bucket(buckets.get(key, None), now, capacity, refill_seconds)
+    if tokens < cost:
+        wait = last + refill_seconds * (cost - tokens) - now
+        raise Exception(f"Rate limited: {method} available again in {wait}s")
+    buckets[key] = ((tokens - cost) << 64) | last
+
 
-def increment_or_init(data, key, amount=1):
-    current = data.get(key, 0)
-    data[key] = current + amount
+def _refill_bucket(packed, now, capacity, refill_seconds):
+    if packed is None:
+        return capacity, now
+    tokens, last = packed >> 64, packed & ((1 << 64) - 1)
+    refilled = max(0, now - last) // refill_seconds
+    if tokens + refilled >= capacity:
+        return capacity, now
+    return tokens + refilled, last + refilled * refill_seconds
 
 
+def _message_timestamp():
+    raw = gl.message_raw["datetime"].replace("Z", "+00:00")
+    return int(datetime.datetime.fromisoformat(raw).timestamp())
+
+
+# ─── genlayer-utils: storage ────────────────────────────────────────────────
+
 def address_map_to_dict(data):
     return {k.as_hex: v for k, v in data.items()}
 
 
+def leaderboard_increment(scores, top, key, amount=1, *, k=20):
+    score = scores.get(key, 0) + amount
+    scores[key] = score
+    n = len(top)
+    pos = -1
+    for i in range(n):
+        if top[i] == key:
+            pos = i
+            break
+    if pos < 0:
+        if n < k:
+            top.append(key)
+            pos = n
+        elif n > 0 and score > scores[top[n - 1]]:
+            pos = n - 1
+        else:
+            return
+    while pos > 0 and scores[top[pos - 1]] < score:
+        top[pos] = top[pos - 1]
+        pos -= 1
+    top[pos] = key
+
+
+def leaderboard_top(scores, top, limit=None, *, key_transform=None):
+    n = len(top) if limit is None else min(limit, len(top))
+    entries = []
+    for i in range(n):
+        key = top[i]
+        entries.append([key_transform(key) if key_transform else key, scores[key]])
+    return entries
+
+
+def index_add(index, field, value, key):
+    index.get_or_insert_default(f"{field}={value}")[key] = True
+
+
+def index_discard(index, field, value, key):
+    bucket = f"{field}={value}"
+    if bucket in index and key in index[bucket]:
+        del index[bucket][key]
+
+
+def index_move(index, field, old_value, new_value, key):
+    if old_value == new_value:
+        return
+    index_discard(index, field, old_value, key)
+    index_add(index, field, new_value, key)
+
+
+def index_lookup(index, field, value, offset=0, limit=100):
+    bucket = f"{field}={value}"
+    if bucket not in index:
+        return []
+    keys = []
+    count = 0
+    for k in index[bucket]:
+        if count < offset:
+            count += 1
+            continue
+        if len(keys) >= limit:
+            break
+        keys.append(k)
+        count += 1
+    return keys
+
+
 # ─── Contract ───────────────────────────────────────────────────────────────
 
+# Upper bounds on the work one resolve_pending_claims transaction can trigger
+MAX_BATCH_SOURCES = 3
+MAX_BATCH_CLAIMS_PER_SOURCE = 20
+
+
 @allow_storage
 @dataclass
 class Claim:
@@ -85,8 +242,11 @@ class Claim:
 class FactChecker(gl.Contract):
     claims: TreeMap[str, Claim]
     reputation: TreeMap[Address, u256]
+    top_contributors: DynArray[Address]  # top 20 by reputation, highest first
     claim_count: u256
     _owner: Address
+    _claim_index: TreeMap[str, TreeMap[str, bool]]  # "verdict=<v>" -> claim ids
+    _rate_limits: TreeMap[str, u256]  # "<method>:<address>" -> packed token bucket
 
     def __init__(self):
         self.claim_count = 0
@@ -94,6 +254,7 @@ class FactChecker(gl.Contract):
 
     @gl.public.write
     def submit_claim(self, claim_text: str, source_url: str) -> None:
+        require_rate_limit(self._rate_limits, "submit_claim", capacity=10, refill_seconds=60)
         self.claim_count += 1
         claim_id = f"claim_{self.claim_count}"
 
@@ -106,9 +267,11 @@ class FactChecker(gl.Contract):
             explanation="",
             is_resolved=False,
         )
+        index_add(self._claim_index, "verdict", "pending", claim_id)
 
     @gl.public.write
     def resolve_claim(self, claim_id: str) -> None:
+        require_rate_limit(self._rate_limits, "resolve_claim", capacity=5, refill_seconds=120)
         if claim_id not in self.claims:
             raise Exception("Claim not found")
 
@@ -116,21 +279,64 @@ class FactChecker(gl.Contract):
         if claim.is_resolved:
             raise Exception("Claim already resolved")
 
-        # genlayer-utils makes this 2 lines instead of 20
+        # genlayer-utils makes this 2 lines instead of 20. web_llm_strict
+        # formats the template again, so escape every other brace
         prompt = fact_check_prompt(claim.text, "{web_data}")
-        result = web_llm_strict(url=claim.source_url, prompt_template=prompt)
+        template = prompt.replace("{", "{{").replace("}", "}}").replace("{{web_data}}", "{web_data}")
+        result = web_llm_strict(url=claim.source_url, prompt_template=template)
 
         claim.verdict = result["verdict"]
+        index_move(self._claim_index, "verdict", "pending", claim.verdict, claim_id)
         claim.explanation = result.get("explanation", "")
         claim.is_resolved = True
 
         # Award reputation to submitter
-        increment_or_init(self.reputation, Address(claim.submitter))
+        leaderboard_increment(self.reputation, self.top_contributors, Address(claim.submitter))
+
+    @gl.public.write
+    def resolve_pending_claims(
+        self, max_sources: int = MAX_BATCH_SOURCES, max_claims_per_source: int = MAX_BATCH_CLAIMS_PER_SOURCE
+    ) -> int:
+        """
+        Resolve pending claims in bulk: group them by source URL, render each
+        source once and judge all of its claims in one prompt. Cost scales
+        with the number of distinct sources, not the number of claims. Both
+        limits are capped at the module constants. Returns the number of
+        claims resolved.
+        """
+        require_rate_limit(self._rate_limits, "resolve_pending_claims", capacity=2, refill_seconds=300)
+        max_sources = max(0, min(max_sources, MAX_BATCH_SOURCES))
+        max_claims_per_source = max(0, min(max_claims_per_source, MAX_BATCH_CLAIMS_PER_SOURCE))
+        pending = index_lookup(self._claim_index, "verdict", "pending", 0, max_sources * max_claims_per_source)
+        by_source = {}
+        for claim_id in pending:
+            url = self.claims[claim_id].source_url
+            if url not in by_source:
+                if len(by_source) >= max_sources:
+                    continue
+                by_source[url] = []
+            if len(by_source[url]) < max_claims_per_source:
+                by_source[url].append(claim_id)
+
+        resolved = 0
+        for url, claim_ids in by_source.items():
+            texts = [self.claims[claim_id].text for claim_id in claim_ids]
+            results = fact_check_batch(url, texts)
+            for claim_id, result in zip(claim_ids, results):
+                claim = self.claims[claim_id]
+                claim.verdict = result["verdict"]
+                index_move(self._claim_index, "verdict", "pending", claim.verdict, claim_id)
+                claim.explanation = result["explanation"]
+                claim.is_resolved = True
+                leaderboard_increment(self.reputation, self.top_contributors, Address(claim.submitter))
+                resolved += 1
+        return resolved
 
     @gl.public.write
     def delete_claim(self, claim_id: str) -> None:
         require_sender(self._owner)
         if claim_id in self.claims:
+            index_discard(self._claim_index, "verdict", self.claims[claim_id].verdict, claim_id)
             del self.claims[claim_id]
 
     @gl.public.view
@@ -151,6 +357,22 @@ class FactChecker(gl.Contract):
             for _, c in self.claims.items()
         ]
 
+    @gl.public.view
+    def get_claims_by_verdict(self, verdict: str, offset: int = 0, limit: int = 100) -> list:
+        """List claims with one verdict (e.g. "false" or "pending") via the index."""
+        claim_ids = index_lookup(self._claim_index, "verdict", verdict, offset, limit)
+        return [
+            {"id": c.id, "text": c.text, "verdict": c.verdict, "is_resolved": c.is_resolved}
+            for c in (self.claims[claim_id] for claim_id in claim_ids)
+        ]
+
     @gl.public.view
     def get_reputation(self) -> dict:
         return address_map_to_dict(self.reputation)
+
+    @gl.public.view
+    def get_top_contributors(self, limit: int = 20) -> list:
+        """Ranked [address, reputation] pairs, served from the top-K list."""
+        return leaderboard_top(
+            self.reputation, self.top_contributors, limit, key_transform=lambda a: a.as_hex
+        )
@@ -1,11 +1,13 @@
 # { "Depends": "py-genlayer:test" }
 #
 # Price Feed — Example GenLayer Intelligent Contract
-# Uses: web_oracle, access_control helpers from genlayer-utils
+# Uses: web_oracle, access_control, storage helpers from genlayer-utils
 #
 # A contract that fetches and stores asset prices from web sources.
 # Demonstrates how GenLayer contracts can act as decentralized price oracles.
 
+import datetime
+import decimal
 import json
 from dataclasses import dataclass
 from genlayer import *
@@ -19,7 +21,7 @@ def fetch_and_extract(url, extraction_prompt, *, mode="text"):
         prompt = extraction_prompt.format(web_data=web_data)
         result = gl.nondet.exec_prompt(prompt, response_format="json")
         if isinstance(result, dict):
-            return json.dumps(result, sort_keys=True)
+            return json.dumps(result, sort_keys=True, separators=(",", ":"))
         return result
     return json.loads(gl.eq_principle.strict_eq(_inner))
 
@@ -31,7 +33,7 @@ WEB CONTENT:
 {{web_data}}
 
 Respond ONLY with this exact JSON format, nothing else:
-{{"price": "<numeric value as string>", "currency": "<USD|EUR|GBP|etc>", "timestamp": "<if available, otherwise unknown>"}}
+{{{{"price": "<numeric value as string>", "currency": "<USD|EUR|GBP|etc>", "timestamp": "<if available, otherwise unknown>"}}}}
 
 Rules:
 - Extract only the most recent/current price
@@ -40,6 +42,135 @@ Rules:
     return fetch_and_extract(url, prompt)
 
 
+def fetch_prices(url, asset_names):
+    names = sorted(set(asset_names))
+    asset_list = "\n".join(f"- {name}" for name in names)
+
+    def _inner():
+        web_data = gl.nondet.web.render(url, mode="text")
+        prompt = f"""Extract the current price of each asset below from this web page.
+
+ASSETS:
+{asset_list}
+
+WEB CONTENT:
+{web_data}
+
+Respond ONLY with this exact JSON format, nothing else:
+{{"prices": {{"<asset name exactly as listed>": {{"price": "<numeric value as string>", "currency": "<USD|EUR|GBP|etc>"}}}}}}
+
+Rules:
+- Use the asset names exactly as listed above as keys
+- Use null for an asset whose price is not on the page
+- Extract only the most recent/current price
+- Your response must be valid JSON only, no extra text"""
+        result = gl.nondet.exec_prompt(prompt, response_format="json")
+        prices = result.get("prices", {}) if isinstance(result, dict) else {}
+        if not isinstance(prices, dict):
+            prices = {}
+        cleaned = {name: _clean_price_entry(prices.get(name)) for name in names}
+        return json.dumps(cleaned, sort_keys=True, separators=(",", ":"))
+    return json.loads(gl.eq_principle.strict_eq(_inner))
+
+
+def _clean_price_entry(entry):
+    if not isinstance(entry, dict):
+        return None
+    price = str(entry.get("price", "")).replace(",", "").replace(" ", "")
+    try:
+        value = decimal.Decimal(price)
+    except decimal.InvalidOperation:
+        return None
+    if not value.is_finite() or not value > 0:
+        return None
+    currency = str(entry.get("currency") or "USD").strip().upper()
+    return {"price": format(value.normalize(), "f"), "currency": currency}
+
+
+def update_policy(last_value, last_checked, fetch_fn, *, heartbeat, deviation="0", field="price"):
+    now = _message_timestamp()
+    if last_value is not None and now - last_checked < heartbeat:
+        return {"fetched": False, "changed": False, "reason": "fresh", "result": None, "checked_at": last_checked}
+    result = fetch_fn()
+    new = _decimal_value(result[field])
+    if last_value is None:
+        reason = "first"
+    else:
+        old = _decimal_value(last_value)
+        moved = abs(new - old)
+        if moved == 0 or (old != 0 and moved / abs(old) <= decimal.Decimal(deviation)):
+            return {"fetched": True, "changed": False, "reason": "within_deviation", "result": result, "checked_at": now}
+        reason = "deviation"
+    return {"fetched": True, "changed": True, "reason": reason, "result": result, "checked_at": now}
+
+
+def _decimal_value(value):
+    try:
+        number = decimal.Decimal(str(value).replace(",", "").strip())
+    except decimal.InvalidOperation:
+        raise Exception(f"Not a decimal value: {value!r}")
+    if not number.is_finite():
+        raise Exception(f"Not a decimal value: {value!r}")
+    return number
+
+
+def _message_timestamp():
+    raw = gl.message_raw["datetime"].replace("Z", "+00:00")
+    return int(datetime.datetime.fromisoformat(raw).timestamp())
+
+
+# ─── genlayer-utils: storage ────────────────────────────────────────────────
+
+U256_MAX = 2**256 - 1
+
+FIXED_ROUNDING = {
+    "down": decimal.ROUND_DOWN,
+    "up": decimal.ROUND_UP,
+    "half_up": decimal.ROUND_HALF_UP,
+    "half_even": decimal.ROUND_HALF_EVEN,
+}
+
+
+def to_fixed(value: str, decimals: int, *, rounding: str = "half_even") -> int:
+    if rounding not in FIXED_ROUNDING:
+        raise Exception(f"Unknown rounding mode: {rounding}")
+    text = str(value).replace(",", "").strip()
+    try:
+        number = decimal.Decimal(text)
+    except decimal.InvalidOperation:
+        raise Exception(f"Not a decimal number: {value!r}")
+    if not number.is_finite() or number < 0:
+        raise Exception(f"Expected a non-negative finite number, got {value!r}")
+    if number and number.adjusted() + decimals > 78:
+        raise Exception(f"{value!r} does not fit in u256 with {decimals} decimals")
+    with decimal.localcontext() as ctx:
+        ctx.prec = 100
+        scaled = int(number.scaleb(decimals).quantize(decimal.Decimal(1), rounding=FIXED_ROUNDING[rounding]))
+    if scaled > U256_MAX:
+        raise Exception(f"{value!r} does not fit in u256 with {decimals} decimals")
+    return scaled
+
+
+def from_fixed(value: int, decimals: int, *, places: int | None = None) -> str:
+    whole, frac = divmod(int(value), 10**decimals)
+    digits = str(frac).rjust(decimals, "0") if decimals > 0 else ""
+    if places is None:
+        digits = digits.rstrip("0")
+    else:
+        digits = digits[:places].ljust(places, "0")
+    return f"{whole}.{digits}" if digits else str(whole)
+
+
+def view_cache_store(cache, name, value):
+    cache[name] = json.dumps(value, sort_keys=True, separators=(",", ":"))
+
+
+def view_cache_read(cache, name, build):
+    if name in cache:
+        return cache[name]
+    return json.dumps(build(), sort_keys=True, separators=(",", ":"))
+
+
 # ─── genlayer-utils: access_control ─────────────────────────────────────────
 
 def require_sender(expected):
@@ -49,35 +180,90 @@ def require_sender(expected):
 
 # ─── Contract ───────────────────────────────────────────────────────────────
 
+PRICE_DECIMALS = 8
+
+
 @allow_storage
 @dataclass
 class PriceRecord:
     asset: str
-    price: str
+    price: u256  # scaled by 10**PRICE_DECIMALS
     currency: str
     source_url: str
     updated_by: str
+    checked_at: u256  # last fetch, Unix seconds
 
 
 class PriceFeed(gl.Contract):
     prices: TreeMap[str, PriceRecord]
     _owner: Address
+    _views: TreeMap[str, str]  # view name -> pre-serialized result
+    heartbeat: u256  # minimum seconds between fetches of one asset
+    deviation: str   # minimum relative move that rewrites a price
 
-    def __init__(self):
+    def __init__(self, heartbeat: int = 60, deviation: str = "0.001"):
         self._owner = gl.message.sender_address
+        # update_policy parses this on every update; reject bad values at deploy
+        try:
+            threshold = decimal.Decimal(deviation)
+        except decimal.InvalidOperation:
+            raise Exception(f"Invalid deviation: {deviation!r}")
+        if not threshold.is_finite() or threshold < 0:
+            raise Exception(f"Deviation must be a finite, non-negative decimal: {deviation!r}")
+        self.heartbeat = heartbeat
+        self.deviation = deviation
+        view_cache_store(self._views, "all_prices", [])
 
     @gl.public.write
-    def update_price(self, asset: str, source_url: str) -> None:
-        """Fetch the current price of an asset from a web source."""
-        result = fetch_price(source_url, asset)
-
-        self.prices[asset] = PriceRecord(
-            asset=asset,
-            price=result["price"],
-            currency=result.get("currency", "USD"),
-            source_url=source_url,
-            updated_by=gl.message.sender_address.as_hex,
+    def update_price(self, asset: str, source_url: str) -> dict:
+        """
+        Fetch the current price of an asset from a web source. Skips the
+        fetch within the heartbeat and the write within the deviation;
+        returns what was done.
+        """
+        record = self.prices[asset] if asset in self.prices else None
+        policy = update_policy(
+            from_fixed(record.price, PRICE_DECIMALS) if record is not None else None,
+            record.checked_at if record is not None else 0,
+            lambda: fetch_price(source_url, asset),
+            heartbeat=self.heartbeat,
+            deviation=self.deviation,
         )
+        if policy["changed"]:
+            result = policy["result"]
+            self.prices[asset] = PriceRecord(
+                asset=asset,
+                price=to_fixed(result["price"], PRICE_DECIMALS),
+                currency=result.get("currency", "USD"),
+                source_url=source_url,
+                updated_by=gl.message.sender_address.as_hex,
+                checked_at=policy["checked_at"],
+            )
+            self._publish_prices()
+        elif policy["fetched"]:
+            record.checked_at = policy["checked_at"]
+        return {"fetched": policy["fetched"], "written": policy["changed"], "reason": policy["reason"]}
+
+    @gl.public.write
+    def update_prices(self, assets: list[str], source_url: str) -> None:
+        """Fetch several prices from one page in a single consensus round."""
+        results = fetch_prices(source_url, assets)
+        updated = 0
+        for asset, result in results.items():
+            if result is None:
+                continue
+            self.prices[asset] = PriceRecord(
+                asset=asset,
+                price=to_fixed(result["price"], PRICE_DECIMALS),
+                currency=result["currency"],
+                source_url=source_url,
+                updated_by=gl.message.sender_address.as_hex,
+                checked_at=_message_timestamp(),
+            )
+            updated += 1
+        if updated == 0:
+            raise Exception("No requested asset price found on the page")
+        self._publish_prices()
 
     @gl.public.view
     def get_price(self, asset: str) -> dict:
@@ -87,22 +273,35 @@ class PriceFeed(gl.Contract):
         p = self.prices[asset]
         return {
             "asset": p.asset,
-            "price": p.price,
+            "price": from_fixed(p.price, PRICE_DECIMALS),
             "currency": p.currency,
             "source_url": p.source_url,
         }
 
-    @gl.public.view
-    def get_all_prices(self) -> list:
-        """Get all stored prices."""
+    def _build_all_prices(self) -> list:
         return [
-            {"asset": p.asset, "price": p.price, "currency": p.currency}
+            {"asset": p.asset, "price": from_fixed(p.price, PRICE_DECIMALS), "currency": p.currency}
             for _, p in self.prices.items()
         ]
 
+    def _publish_prices(self) -> None:
+        # Writes are rare next to dashboard polling, so pay the rebuild here
+        view_cache_store(self._views, "all_prices", self._build_all_prices())
+
+    @gl.public.view
+    def get_all_prices(self) -> list:
+        """Get all stored prices."""
+        return json.loads(self.get_all_prices_json())
+
+    @gl.public.view
+    def get_all_prices_json(self) -> str:
+        """All prices as JSON, read from the snapshot the writes keep current."""
+        return view_cache_read(self._views, "all_prices", self._build_all_prices)
+
     @gl.public.write
     def remove_price(self, asset: str) -> None:
         """Remove a price entry (owner only)."""
         require_sender(self._owner)
         if asset in self.prices:
             del self.prices[asset]
+            self._publish_prices()
@@ -1,8 +1,111 @@
+import datetime
+from dataclasses import dataclass
 from genlayer import *
 
+
+# ─── genlayer-utils: storage ────────────────────────────────────────────────
+
+TIMESERIES_RESOLUTIONS = {"1m": 60, "1h": 3600, "1d": 86400}
+
+
+@allow_storage
+@dataclass
+class OHLCBucket:
+    start: u256
+    open: u256
+    high: u256
+    low: u256
+    close: u256
+    count: u256
+
+
+def message_timestamp():
+    raw = gl.message_raw["datetime"].replace("Z", "+00:00")
+    return int(datetime.datetime.fromisoformat(raw).timestamp())
+
+
+def timeseries_append(series, timestamp, value, bucket_seconds, *, max_buckets=1000):
+    start = timestamp - timestamp % bucket_seconds
+    n = len(series)
+    if n == 0 or start > series[n - 1].start:
+        series.append(OHLCBucket(start=start, open=value, high=value, low=value, close=value, count=1))
+        if len(series) >= 2 * max_buckets:
+            _timeseries_compact(series, max_buckets)
+        return
+    idx = _timeseries_search(series, start)
+    if idx < 0 or series[idx].start != start:
+        raise Exception(f"Out-of-order sample at {timestamp} has no bucket to update")
+    bucket = series[idx]
+    if value > bucket.high:
+        bucket.high = value
+    if value < bucket.low:
+        bucket.low = value
+    if idx == n - 1:
+        bucket.close = value
+    bucket.count += 1
+
+
+def timeseries_record(history, name, timestamp, value, *, resolutions=TIMESERIES_RESOLUTIONS, max_buckets=1000):
+    for label, seconds in resolutions.items():
+        series = history.get_or_insert_default(f"{name}:{label}")
+        timeseries_append(series, timestamp, value, seconds, max_buckets=max_buckets)
+
+
+def timeseries_at(series, timestamp):
+    idx = _timeseries_search(series, timestamp)
+    if idx < 0:
+        return None
+    return _bucket_to_dict(series[idx])
+
+
+def timeseries_range(series, start, end, limit=500):
+    idx = _timeseries_search(series, start)
+    if idx < 0 or series[idx].start < start:
+        idx += 1
+    items = []
+    n = len(series)
+    while idx < n and len(items) < limit:
+        bucket = series[idx]
+        if bucket.start > end:
+            break
+        items.append(_bucket_to_dict(bucket))
+        idx += 1
+    return items
+
+
+def _timeseries_search(series, timestamp):
+    lo, hi = 0, len(series)
+    while lo < hi:
+        mid = (lo + hi) // 2
+        if series[mid].start <= timestamp:
+            lo = mid + 1
+        else:
+            hi = mid
+    return lo - 1
+
+
+def _timeseries_compact(series, keep):
+    n = len(series)
+    drop = n - keep
+    for i in range(keep):
+        series[i] = series[i + drop]
+    for _ in range(drop):
+        series.pop()
+
+
+def _bucket_to_dict(bucket):
+    return {
+        "start": bucket.start, "open": bucket.open, "high": bucket.high,
+        "low": bucket.low, "close": bucket.close, "count": bucket.count,
+    }
+
+
+# ─── Contract ───────────────────────────────────────────────────────────────
+
 class PriceFeedWithEvents(gl.Contract):
     _prices: TreeMap[str, u256]
     _events: TreeMap[str, DynArray[dict]]
+    _history: TreeMap[str, DynArray[OHLCBucket]]  # "<symbol>:<1m|1h|1d>" -> OHLC buckets
 
     def __init__(self):
         pass
@@ -11,6 +114,7 @@ class PriceFeedWithEvents(gl.Contract):
     def update_price(self, symbol: str, price: u256) -> None:
         require_sender(self._owner) if hasattr(self, '_owner') else None
         self._prices[symbol] = price
+        timeseries_record(self._history, symbol, message_timestamp(), price)
         append_indexed_event(self._events, 'PriceUpdated', (symbol.encode('utf-8'),), {'symbol': symbol, 'price': price})
         gl.advanced.emit_raw_event([b'PriceUpdated', symbol.encode('utf-8')], {'symbol': symbol, 'price': price})
 
@@ -21,3 +125,17 @@ class PriceFeedWithEvents(gl.Contract):
     @gl.public.view
     def get_price_events(self, offset: int = 0, limit: int = 100) -> list:
         return query_indexed_events(self._events, 'PriceUpdated', offset=offset, limit=limit)
+
+    @gl.public.view
+    def get_price_at(self, symbol: str, timestamp: int, resolution: str = "1m") -> dict | None:
+        key = f"{symbol}:{resolution}"
+        if key not in self._history:
+            return None
+        return timeseries_at(self._history[key], timestamp)
+
+    @gl.public.view
+    def get_price_history(self, symbol: str, start: int, end: int, resolution: str = "1h") -> list:
+        key = f"{symbol}:{resolution}"
+        if key not in self._history:
+            return []
+        return timeseries_range(self._history[key], start, end)
@@ -1,6 +1,38 @@
 from genlayer import *
 
 
+# ─── genlayer-utils: access_control ─────────────────────────────────────────
+
+def multicall_impl(impl_address, calls):
+    target = gl.get_contract_at(impl_address).emit()
+    _run_calls(target, calls)
+
+
+def multicall_view(impl_address, calls):
+    target = gl.get_contract_at(impl_address).view()
+    return _run_calls(target, calls)
+
+
+def _run_calls(target, calls):
+    methods = {}
+    results = []
+    for call in calls:
+        method_name = call[0]
+        args = call[1] if len(call) > 1 else []
+        kwargs = call[2] if len(call) > 2 else {}
+        fn = methods.get(method_name)
+        if fn is None:
+            try:
+                fn = getattr(target, method_name)
+            except AttributeError:
+                raise Exception(f"Unknown method on implementation: {method_name}")
+            methods[method_name] = fn
+        results.append(fn(*args, **kwargs))
+    return results
+
+
+# ─── Contract ───────────────────────────────────────────────────────────────
+
 class UpgradeableProxy(gl.Contract):
     _owner: Address
     _impl: Address
@@ -24,6 +56,20 @@ class UpgradeableProxy(gl.Contract):
             raise Exception("Only owner can transfer ownership")
         self._owner = new_owner
 
+    @gl.public.write
+    def multicall(self, calls: list) -> None:
+        """
+        Send several implementation writes from one transaction.
+        `calls` is a list of [method_name, args, kwargs]. The writes are
+        queued messages, so nothing is returned.
+        """
+        multicall_impl(self._impl, calls)
+
+    @gl.public.view
+    def multicall_view(self, calls: list) -> list:
+        """Batch several implementation view reads; returns each result in order."""
+        return multicall_view(self._impl, calls)
+
     @gl.public.write.payable
     def __handle_undefined_method__(self, method_name: str, args: list, kwargs: dict) -> None:
         """
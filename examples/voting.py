@@ -7,6 +7,7 @@
 # Admins create proposals, registered voters cast votes,
 # and results are tallied transparently.
 
+import hashlib
 from dataclasses import dataclass
 from genlayer import *
 
@@ -23,6 +24,20 @@ def require_not_zero(address):
         raise Exception("Zero address not allowed")
 
 
+def merkle_leaf(address):
+    return hashlib.sha256(b"\x00" + address.as_bytes).digest()
+
+
+def verify_merkle_proof(root, leaf, proof):
+    node = leaf
+    for sibling in proof:
+        if isinstance(sibling, str):
+            sibling = bytes.fromhex(sibling.removeprefix("0x"))
+        low, high = (node, sibling) if node <= sibling else (sibling, node)
+        node = hashlib.sha256(b"\x01" + low + high).digest()
+    return node == root
+
+
 # ─── genlayer-utils: storage ────────────────────────────────────────────────
 
 def increment_or_init(data, key, amount=1):
@@ -44,6 +59,40 @@ def treemap_paginate(data, offset=0, limit=10):
     return items
 
 
+def index_add(index, field, value, key):
+    index.get_or_insert_default(f"{field}={value}")[key] = True
+
+
+def index_discard(index, field, value, key):
+    bucket = f"{field}={value}"
+    if bucket in index and key in index[bucket]:
+        del index[bucket][key]
+
+
+def index_move(index, field, old_value, new_value, key):
+    if old_value == new_value:
+        return
+    index_discard(index, field, old_value, key)
+    index_add(index, field, new_value, key)
+
+
+def index_lookup(index, field, value, offset=0, limit=100):
+    bucket = f"{field}={value}"
+    if bucket not in index:
+        return []
+    keys = []
+    count = 0
+    for k in index[bucket]:
+        if count < offset:
+            count += 1
+            continue
+        if len(keys) >= limit:
+            break
+        keys.append(k)
+        count += 1
+    return keys
+
+
 # ─── Contract ───────────────────────────────────────────────────────────────
 
 @allow_storage
@@ -65,12 +114,15 @@ class Voting(gl.Contract):
     votes: TreeMap[str, TreeMap[Address, bool]]  # proposal_id -> voter -> voted
     _owner: Address
     _voters: TreeMap[Address, bool]  # registered voters
+    _voter_root: bytes  # Merkle root of a bulk-registered electorate (empty if unused)
+    _proposal_index: TreeMap[str, TreeMap[str, bool]]  # "is_active=<b>" -> proposal ids
 
     def __init__(self):
         self.proposal_count = 0
         self._owner = gl.message.sender_address
         # Owner is automatically a registered voter
         self._voters[gl.message.sender_address] = True
+        self._voter_root = b""
 
     def _require_owner(self) -> None:
         if gl.message.sender_address != self._owner:
@@ -89,6 +141,16 @@ class Voting(gl.Contract):
         require_not_zero(voter)
         self._voters[voter] = True
 
+    @gl.public.write
+    def set_voter_root(self, root: str) -> None:
+        """
+        Register a whole electorate at once by committing its Merkle root
+        (owner only). Build the root and per-voter proofs offline with
+        scripts/build_merkle_allowlist.py; voters then use vote_with_proof.
+        """
+        self._require_owner()
+        self._voter_root = bytes.fromhex(root.removeprefix("0x"))
+
     @gl.public.write
     def remove_voter(self, voter: Address) -> None:
         """Remove a voter (owner only)."""
@@ -112,6 +174,7 @@ class Voting(gl.Contract):
             no_votes=0,
             is_active=True,
         )
+        index_add(self._proposal_index, "is_active", True, proposal_id)
 
     @gl.public.write
     def close_proposal(self, proposal_id: str) -> None:
@@ -119,7 +182,9 @@ class Voting(gl.Contract):
         self._require_owner()
         if proposal_id not in self.proposals:
             raise Exception("Proposal not found")
-        self.proposals[proposal_id].is_active = False
+        proposal = self.proposals[proposal_id]
+        index_move(self._proposal_index, "is_active", proposal.is_active, False, proposal_id)
+        proposal.is_active = False
 
     # ─── Voter methods ───────────────────────────────────────────────
 
@@ -127,7 +192,23 @@ class Voting(gl.Contract):
     def vote(self, proposal_id: str, support: bool) -> None:
         """Cast a vote on a proposal (registered voters only)."""
         self._require_voter()
+        self._cast_vote(proposal_id, support)
 
+    @gl.public.write
+    def vote_with_proof(self, proposal_id: str, support: bool, proof: list) -> None:
+        """
+        Cast a vote as a member of the Merkle-committed electorate.
+        The first successful proof registers the voter, so later votes can
+        use vote() without a proof.
+        """
+        sender = gl.message.sender_address
+        if not self._voters.get(sender, False):
+            if not self._voter_root or not verify_merkle_proof(self._voter_root, merkle_leaf(sender), proof):
+                raise Exception("Only registered voters can vote")
+            self._voters[sender] = True
+        self._cast_vote(proposal_id, support)
+
+    def _cast_vote(self, proposal_id: str, support: bool) -> None:
         if proposal_id not in self.proposals:
             raise Exception("Proposal not found")
 
@@ -178,6 +259,15 @@ class Voting(gl.Contract):
             for _, p in entries
         ]
 
+    @gl.public.view
+    def get_active_proposals(self, page: int = 0) -> list:
+        """Get open proposals (10 per page) without scanning closed ones."""
+        proposal_ids = index_lookup(self._proposal_index, "is_active", True, page * 10, 10)
+        return [
+            {"id": p.id, "title": p.title, "yes_votes": p.yes_votes, "no_votes": p.no_votes}
+            for p in (self.proposals[proposal_id] for proposal_id in proposal_ids)
+        ]
+
     @gl.public.view
     def is_registered_voter(self, address: Address) -> bool:
         return self._voters.get(address, False)
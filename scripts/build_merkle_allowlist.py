@@ -0,0 +1,111 @@
+# genlayer-utils: build_merkle_allowlist.py
+# Offline builder for the Merkle allowlists verified by access_control.py
+#
+# Reads addresses (one 0x-prefixed hex address per line), builds the tree
+# with the same hashing as `merkle_leaf` / `verify_merkle_proof`, and writes
+# the root plus one proof per address as JSON:
+#
+#   {"root": "0x...", "count": 3, "proofs": {"0xabc...": ["0x...", ...], ...}}
+#
+# Usage:
+#   python scripts/build_merkle_allowlist.py voters.txt -o allowlist.json
+#
+# The owner commits "root" on-chain; each member submits their own proof.
+# Runs on the host with the standard library only.
+
+import argparse
+import hashlib
+import json
+import sys
+
+
+def address_bytes(address: str) -> bytes:
+    """Parse a 0x-prefixed 20-byte hex address."""
+    raw = bytes.fromhex(address.strip().removeprefix("0x").removeprefix("0X"))
+    if len(raw) != 20:
+        raise ValueError(f"Not a 20-byte address: {address!r}")
+    return raw
+
+
+def leaf_hash(address: str) -> bytes:
+    return hashlib.sha256(b"\x00" + address_bytes(address)).digest()
+
+
+def node_hash(a: bytes, b: bytes) -> bytes:
+    low, high = (a, b) if a <= b else (b, a)
+    return hashlib.sha256(b"\x01" + low + high).digest()
+
+
+def build_tree(addresses: list[str]) -> list[list[bytes]]:
+    """
+    Build all tree levels, leaves first. Leaves are deduplicated and sorted
+    so the same address set always yields the same root. An odd node at the
+    end of a level is carried up unchanged.
+    """
+    leaves = sorted({leaf_hash(a) for a in addresses})
+    if not leaves:
+        raise ValueError("Allowlist is empty")
+    levels = [leaves]
+    while len(levels[-1]) > 1:
+        level = levels[-1]
+        parents = [node_hash(level[i], level[i + 1]) for i in range(0, len(level) - 1, 2)]
+        if len(level) % 2:
+            parents.append(level[-1])
+        levels.append(parents)
+    return levels
+
+
+def proof_for(levels: list[list[bytes]], leaf: bytes) -> list[bytes]:
+    """Sibling hashes from `leaf` up to the root."""
+    index = levels[0].index(leaf)
+    proof = []
+    for level in levels[:-1]:
+        sibling = index ^ 1
+        if sibling < len(level):
+            proof.append(level[sibling])
+        index //= 2
+    return proof
+
+
+def verify_proof(root: bytes, leaf: bytes, proof: list[bytes]) -> bool:
+    """Offline mirror of access_control.verify_merkle_proof."""
+    node = leaf
+    for sibling in proof:
+        node = node_hash(node, sibling)
+    return node == root
+
+
+def build_allowlist(addresses: list[str]) -> dict:
+    """Return {"root", "count", "proofs"} with hex-encoded hashes."""
+    levels = build_tree(addresses)
+    root = levels[-1][0]
+    proofs = {}
+    for address in addresses:
+        key = "0x" + address_bytes(address).hex()
+        proofs[key] = ["0x" + h.hex() for h in proof_for(levels, leaf_hash(address))]
+    return {"root": "0x" + root.hex(), "count": len(levels[0]), "proofs": proofs}
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Build a Merkle allowlist root and proofs.")
+    parser.add_argument("addresses", help="File with one hex address per line ('-' for stdin)")
+    parser.add_argument("-o", "--output", help="Write JSON here instead of stdout")
+    args = parser.parse_args(argv)
+
+    source = sys.stdin if args.addresses == "-" else open(args.addresses, "r", encoding="utf-8")
+    with source:
+        addresses = [line.strip() for line in source if line.strip() and not line.startswith("#")]
+
+    allowlist = build_allowlist(addresses)
+    out = json.dumps(allowlist, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(out + "\n")
+        print(f"root {allowlist['root']} for {allowlist['count']} addresses", file=sys.stderr)
+    else:
+        print(out)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
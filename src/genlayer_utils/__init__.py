@@ -6,3 +6,4 @@
 #   access_control - Owner and role-based access guards
 #   web_oracle     - Web data extraction with consensus
 #   storage        - TreeMap/DynArray helpers
+#   cassette       - Record/replay of nondet calls for offline tests (host-side)
@@ -5,8 +5,12 @@
 # Copy the functions and patterns you need into your contract file.
 #
 # Requires: from genlayer import *
+#           import hashlib  (only for the Merkle allowlist helpers)
+#           import datetime  (only for the rate-limit helpers)
 
 
+import datetime
+import hashlib
 from genlayer import *
 
 
@@ -86,6 +90,220 @@ def forward_to_impl(impl_address: Address, method_name: str, *args, **kwargs):
         raise Exception(f"Unknown method on implementation: {method_name}")
 
 
+def multicall_impl(impl_address: Address, calls: list) -> None:
+    """
+    Send several write calls to an implementation contract from one
+    transaction. The contract handle and each method lookup are resolved
+    once and reused for the whole batch.
+
+    Writes through `.emit()` are queued messages, not synchronous calls:
+    each one runs after this transaction, so no return values are
+    available here. Use `multicall_view` to read results.
+
+    Calls are forwarded without attached value (forwarding `gl.message.value`
+    on every call would spend it repeatedly); use `forward_to_impl` for
+    payable methods.
+
+    Args:
+        impl_address: Implementation contract address
+        calls: List of [method_name, args, kwargs]; args and kwargs are optional
+
+    Example:
+        @gl.public.write
+        def multicall(self, calls: list) -> None:
+            multicall_impl(self._impl, calls)
+
+        # client: proxy.multicall([["submit_claim", ["...", "https://..."]],
+        #                          ["submit_claim", ["...", "https://..."]]])
+    """
+    target = gl.get_contract_at(impl_address).emit()
+    _run_calls(target, calls)
+
+
+def multicall_view(impl_address: Address, calls: list) -> list:
+    """
+    Read-only counterpart of `multicall_impl`: batch several view reads
+    against an implementation contract into one call.
+
+    Returns:
+        List with the return value of each call, in order
+
+    Example:
+        @gl.public.view
+        def multicall_view(self, calls: list) -> list:
+            return multicall_view(self._impl, calls)
+    """
+    target = gl.get_contract_at(impl_address).view()
+    return _run_calls(target, calls)
+
+
+def _run_calls(target, calls: list) -> list:
+    methods = {}
+    results = []
+    for call in calls:
+        method_name = call[0]
+        args = call[1] if len(call) > 1 else []
+        kwargs = call[2] if len(call) > 2 else {}
+        fn = methods.get(method_name)
+        if fn is None:
+            try:
+                fn = getattr(target, method_name)
+            except AttributeError:
+                raise Exception(f"Unknown method on implementation: {method_name}")
+            methods[method_name] = fn
+        results.append(fn(*args, **kwargs))
+    return results
+
+
+# =============================================================================
+# Merkle Allowlists (one root in storage, O(log n) proofs per member)
+# =============================================================================
+#
+# Instead of one owner transaction and one storage slot per allowed address,
+# the owner commits a single Merkle root. Each caller proves membership with
+# the sibling hashes on the path from their leaf to the root. Build the tree
+# and proofs offline with scripts/build_merkle_allowlist.py.
+#
+# Hashing: leaf = sha256(0x00 || address bytes)
+#          node = sha256(0x01 || min(a, b) || max(a, b))
+# The prefixes keep a leaf from being passed off as an inner node, and
+# sorting each pair means proofs need no left/right flags.
+
+
+def merkle_leaf(address: Address) -> bytes:
+    """Leaf hash of an address in a Merkle allowlist."""
+    return hashlib.sha256(b"\x00" + address.as_bytes).digest()
+
+
+def verify_merkle_proof(root: bytes, leaf: bytes, proof: list) -> bool:
+    """
+    Check that `leaf` is in the tree with the given `root`.
+
+    Args:
+        root: 32-byte Merkle root
+        leaf: Leaf hash (see `merkle_leaf`)
+        proof: Sibling hashes from leaf to root, as bytes or hex strings
+
+    Returns:
+        True if the proof leads to `root`
+    """
+    node = leaf
+    for sibling in proof:
+        if isinstance(sibling, str):
+            sibling = bytes.fromhex(sibling.removeprefix("0x"))
+        low, high = (node, sibling) if node <= sibling else (sibling, node)
+        node = hashlib.sha256(b"\x01" + low + high).digest()
+    return node == root
+
+
+def require_merkle_member(root: bytes, proof: list, cache: TreeMap | None = None) -> None:
+    """
+    Revert unless the sender is in the Merkle allowlist with `root`.
+
+    With a `cache` (TreeMap[Address, bool]) a verified sender is stored, so
+    later calls cost one lookup and need no proof. Clear or replace the
+    cache when the root changes if removals must take effect.
+
+    Args:
+        root: Merkle root committed by the owner
+        proof: Sender's proof (list of bytes or hex strings; may be empty
+               when the sender is already cached)
+        cache: Optional TreeMap[Address, bool] of verified members
+
+    Example:
+        @gl.public.write
+        def claim(self, proof: list) -> None:
+            require_merkle_member(self._allowlist_root, proof, self._verified)
+            # ... only allowlisted callers reach here
+    """
+    sender = gl.message.sender_address
+    if cache is not None and cache.get(sender, False):
+        return
+    if not verify_merkle_proof(root, merkle_leaf(sender), proof):
+        raise Exception("Unauthorized: caller is not in the allowlist")
+    if cache is not None:
+        cache[sender] = True
+
+
+# =============================================================================
+# Rate Limiting (token bucket per method and address)
+# =============================================================================
+#
+# Methods that trigger LLM or web calls are expensive for every validator.
+# Give each (method, sender) pair a token bucket: `capacity` calls in a
+# burst, then one more every `refill_seconds`. The bucket is one u256 in a
+# TreeMap, `tokens << 64 | last_refill`, refilled lazily when read, so a
+# guarded call costs one storage read and one write.
+#
+#   class MyContract(gl.Contract):
+#       _rate_limits: TreeMap[str, u256]   # "<method>:<address>" -> packed bucket
+
+
+_RATE_TIME_MASK = (1 << 64) - 1
+
+
+def require_rate_limit(
+    buckets: TreeMap,
+    method: str,
+    capacity: int,
+    refill_seconds: int,
+    *,
+    cost: int = 1,
+) -> None:
+    """
+    Revert if the sender has used up their calls to `method`, otherwise
+    spend `cost` tokens. A new sender starts with a full bucket.
+
+    Args:
+        buckets: TreeMap[str, u256] holding packed buckets
+        method: Name of the guarded method (each method has its own limit)
+        capacity: Maximum burst of calls
+        refill_seconds: Seconds to regain one call
+        cost: Tokens this call spends
+
+    Example:
+        @gl.public.write
+        def moderate(self, post_id: str) -> None:
+            require_rate_limit(self._rate_limits, "moderate", capacity=5, refill_seconds=120)
+            # ... LLM call
+    """
+    key = f"{method}:{gl.message.sender_address.as_hex}"
+    now = _message_timestamp()
+    tokens, last = _refill_bucket(buckets.get(key, None), now, capacity, refill_seconds)
+    if tokens < cost:
+        wait = last + refill_seconds * (cost - tokens) - now
+        raise Exception(f"Rate limited: {method} available again in {wait}s")
+    buckets[key] = ((tokens - cost) << 64) | last
+
+
+def rate_limit_status(buckets: TreeMap, method: str, account: Address, capacity: int, refill_seconds: int) -> dict:
+    """
+    Remaining calls for `account` and seconds until the next token, for a
+    view method. Reads only.
+    """
+    now = _message_timestamp()
+    tokens, last = _refill_bucket(buckets.get(f"{method}:{account.as_hex}", None), now, capacity, refill_seconds)
+    next_token = 0 if tokens >= capacity else last + refill_seconds - now
+    return {"remaining": tokens, "next_token_in": next_token}
+
+
+def _refill_bucket(packed: int | None, now: int, capacity: int, refill_seconds: int) -> tuple[int, int]:
+    if packed is None:
+        return capacity, now
+    tokens, last = packed >> 64, packed & _RATE_TIME_MASK
+    refilled = max(0, now - last) // refill_seconds
+    if tokens + refilled >= capacity:
+        return capacity, now
+    # Advance by whole tokens only, so partial progress carries over
+    return tokens + refilled, last + refilled * refill_seconds
+
+
+def _message_timestamp() -> int:
+    # Same as message_timestamp in storage.py
+    raw = gl.message_raw["datetime"].replace("Z", "+00:00")
+    return int(datetime.datetime.fromisoformat(raw).timestamp())
+
+
 # =============================================================================
 # Ownable Pattern (copy this section into your contract)
 # =============================================================================
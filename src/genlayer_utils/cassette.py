@@ -0,0 +1,221 @@
+# genlayer-utils: cassette.py
+# Record/replay layer for non-deterministic calls in tests
+#
+# Records the responses of gl.nondet.web.render, gl.nondet.web.get and
+# gl.nondet.exec_prompt into a JSON fixture file once, then replays them
+# deterministically by request hash. Test suites that exercise contracts
+# in-process (e.g. a direct-mode runner) can then run offline in seconds.
+#
+# This module runs on the test host, NOT inside a contract. Do not copy it
+# into contract files.
+#
+# Requires: nothing beyond the standard library
+
+import base64
+import hashlib
+import json
+import os
+
+
+RECORD = "record"
+REPLAY = "replay"
+PASSTHROUGH = "passthrough"
+
+# Set GENLAYER_CASSETTE=record to refresh fixtures against live services
+MODE_ENV_VAR = "GENLAYER_CASSETTE"
+
+
+class CassetteMiss(Exception):
+    """Raised in replay mode when a request has no recorded response."""
+
+
+class CassetteResponse:
+    """Replayed stand-in for the object returned by gl.nondet.web.get()."""
+
+    def __init__(self, status: int, headers: dict, body: bytes | None):
+        self.status = status
+        self.headers = headers
+        self.body = body
+
+
+def request_key(fn_name: str, args: tuple, kwargs: dict) -> str:
+    """
+    Stable hash of a nondet call. Bytes arguments (e.g. images) are hashed
+    by content so the key does not depend on object identity.
+
+    Args:
+        fn_name: "render", "get" or "exec_prompt"
+        args: Positional arguments of the call
+        kwargs: Keyword arguments of the call
+
+    Returns:
+        Hex sha256 digest
+    """
+    payload = {
+        "fn": fn_name,
+        "args": [_encode_arg(a) for a in args],
+        "kwargs": {k: _encode_arg(v) for k, v in sorted(kwargs.items())},
+    }
+    canonical = json.dumps(payload, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+class Cassette:
+    """
+    Patch a `gl` namespace so nondet calls are recorded to / replayed from
+    a fixture file.
+
+    Args:
+        path: Fixture file, e.g. "tests/cassettes/price_feed.json"
+        mode: "record", "replay" or "passthrough". Defaults to the
+              GENLAYER_CASSETTE environment variable, then "replay"
+
+    Example:
+        from genlayer import gl
+        from genlayer_utils.cassette import Cassette
+
+        def test_update_price():
+            with Cassette("tests/cassettes/price_feed.json").install(gl):
+                contract.update_price("Bitcoin", "https://www.coingecko.com/en/coins/bitcoin")
+    """
+
+    def __init__(self, path: str, mode: str | None = None):
+        if mode is None:
+            mode = os.environ.get(MODE_ENV_VAR, REPLAY)
+        if mode not in (RECORD, REPLAY, PASSTHROUGH):
+            raise ValueError(f"Unknown cassette mode: {mode}")
+        self.path = path
+        self.mode = mode
+        self.entries = {}
+        self._gl = None
+        self._originals = {}
+        self._dirty = False
+        if os.path.exists(path):
+            with open(path, "r", encoding="utf-8") as f:
+                self.entries = json.load(f)
+
+    def install(self, gl) -> "Cassette":
+        """Patch render, get and exec_prompt on the given gl namespace."""
+        if self._gl is not None:
+            raise RuntimeError("Cassette is already installed")
+        self._gl = gl
+        self._originals = {
+            "render": gl.nondet.web.render,
+            "get": gl.nondet.web.get,
+            "exec_prompt": gl.nondet.exec_prompt,
+        }
+        if self.mode != PASSTHROUGH:
+            gl.nondet.web.render = self._wrap("render")
+            gl.nondet.web.get = self._wrap("get")
+            gl.nondet.exec_prompt = self._wrap("exec_prompt")
+        return self
+
+    def uninstall(self) -> None:
+        """Restore the original functions and write new recordings to disk."""
+        if self._gl is None:
+            return
+        self._gl.nondet.web.render = self._originals["render"]
+        self._gl.nondet.web.get = self._originals["get"]
+        self._gl.nondet.exec_prompt = self._originals["exec_prompt"]
+        self._gl = None
+        self.save()
+
+    def save(self) -> None:
+        """Write recorded entries to the fixture file (record mode only)."""
+        if self.mode != RECORD or not self._dirty:
+            return
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(self.path, "w", encoding="utf-8") as f:
+            json.dump(self.entries, f, indent=2, sort_keys=True)
+            f.write("\n")
+        self._dirty = False
+
+    def __enter__(self) -> "Cassette":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.uninstall()
+
+    def _wrap(self, fn_name: str):
+        original = self._originals[fn_name]
+
+        def _call(*args, **kwargs):
+            key = request_key(fn_name, args, kwargs)
+            if self.mode == REPLAY:
+                if key not in self.entries:
+                    raise CassetteMiss(
+                        f"No recorded {fn_name} response for {args[:1]!r} in {self.path}; "
+                        f"re-record with {MODE_ENV_VAR}=record"
+                    )
+                return _decode_response(fn_name, self.entries[key]["response"])
+            response = original(*args, **kwargs)
+            self.entries[key] = {
+                "fn": fn_name,
+                "request": _encode_arg(args[0]) if args else None,
+                "response": _encode_response(fn_name, response),
+            }
+            self._dirty = True
+            return response
+
+        return _call
+
+
+def _encode_arg(value):
+    if isinstance(value, bytes):
+        return {"sha256": hashlib.sha256(value).hexdigest()}
+    if hasattr(value, "raw") and isinstance(value.raw, bytes):
+        return {"sha256": hashlib.sha256(value.raw).hexdigest()}
+    if isinstance(value, (list, tuple)):
+        return [_encode_arg(v) for v in value]
+    if isinstance(value, dict):
+        return {str(k): _encode_arg(v) for k, v in value.items()}
+    if value is None or isinstance(value, (str, int, float, bool)):
+        return value
+    return repr(value)
+
+
+def _encode_bytes(value: bytes | None):
+    if value is None:
+        return None
+    return {"b64": base64.b64encode(value).decode("ascii")}
+
+
+def _decode_bytes(value):
+    if value is None:
+        return None
+    return base64.b64decode(value["b64"])
+
+
+def _encode_response(fn_name: str, response):
+    if fn_name == "get":
+        return {
+            "status": response.status,
+            "headers": {
+                k: (_encode_bytes(v) if isinstance(v, bytes) else v)
+                for k, v in dict(response.headers).items()
+            },
+            "body": _encode_bytes(response.body),
+        }
+    if isinstance(response, bytes):
+        return _encode_bytes(response)
+    if hasattr(response, "raw") and isinstance(response.raw, bytes):
+        # Screenshots are replayed as raw encoded bytes
+        return _encode_bytes(response.raw)
+    return {"value": response}
+
+
+def _decode_response(fn_name: str, stored):
+    if fn_name == "get":
+        return CassetteResponse(
+            status=stored["status"],
+            headers={
+                k: (_decode_bytes(v) if isinstance(v, dict) else v)
+                for k, v in stored["headers"].items()
+            },
+            body=_decode_bytes(stored["body"]),
+        )
+    if "b64" in stored:
+        return _decode_bytes(stored)
+    return stored["value"]
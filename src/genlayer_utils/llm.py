@@ -135,6 +135,59 @@ Rules:
 - Your response must be valid JSON only, no extra text"""
 
 
+def fact_check_batch_prompt(
+    claims: list[str],
+    evidence: str,
+    verdicts: list[str] | None = None,
+) -> str:
+    """
+    Build one fact-checking prompt for several claims that share the same
+    evidence (e.g. claims citing the same source page). One LLM call then
+    judges the whole batch instead of one call per claim.
+
+    Unlike `fact_check_prompt`, pass the evidence text itself rather than a
+    {web_data} placeholder: the claims are user input and may contain braces.
+
+    Args:
+        claims: Claim texts, judged in this order
+        evidence: The evidence text
+        verdicts: Valid verdict labels (default: true/false/partially_true)
+
+    Returns:
+        A formatted prompt string. The expected response is
+        {"results": [{"claim": 1, "verdict": "...", "explanation": "..."}, ...]}
+
+    Example:
+        prompt = fact_check_batch_prompt(
+            claims=["Python was created in 1991", "Python is statically typed"],
+            evidence=web_data,
+        )
+        result = gl.nondet.exec_prompt(prompt, response_format="json")
+    """
+    if verdicts is None:
+        verdicts = ["true", "false", "partially_true"]
+    v = "|".join(verdicts)
+    numbered = "\n".join(f"{i}. {claim}" for i, claim in enumerate(claims, start=1))
+
+    return f"""You are a fact-checker. Based on the evidence provided,
+determine for each numbered claim whether it is {" or ".join(verdicts)}.
+
+CLAIMS:
+{numbered}
+
+EVIDENCE:
+{evidence}
+
+Respond ONLY with this exact JSON format, nothing else:
+{{"results": [{{"claim": <claim number>, "verdict": "<{v}>", "explanation": "<brief 1 sentence explanation>"}}]}}
+
+Rules:
+- Include exactly one result per claim, in the same order as the claims
+- Base each verdict strictly on the provided evidence
+- Keep each explanation concise and factual
+- Your response must be valid JSON only, no extra text"""
+
+
 def yes_no_prompt(question: str, context: str = "") -> str:
     """
     Build a yes/no question prompt. Maximum consensus reliability
@@ -207,3 +260,33 @@ def validate_enum_field(
             raise Exception(f"Invalid verdict: {result.get('verdict')}")
     """
     return result.get(field) in allowed
+
+
+def validate_batch_verdicts(
+    result: dict, count: int, allowed: list[str]
+) -> bool:
+    """
+    Check a `fact_check_batch_prompt` response: exactly `count` results,
+    numbered 1..count in order, each with an allowed verdict.
+
+    Args:
+        result: The parsed dict from exec_prompt
+        count: Number of claims in the prompt
+        allowed: List of allowed verdicts
+
+    Returns:
+        True if the response covers every claim with a valid verdict
+
+    Example:
+        if not validate_batch_verdicts(result, len(claims), ["true", "false", "partially_true"]):
+            raise Exception("LLM response does not cover every claim")
+    """
+    results = result.get("results")
+    if not isinstance(results, list) or len(results) != count:
+        return False
+    for i, item in enumerate(results, start=1):
+        if not isinstance(item, dict) or item.get("claim") != i:
+            return False
+        if item.get("verdict") not in allowed:
+            return False
+    return True
@@ -7,17 +7,146 @@
 #
 # Requires: from genlayer import *
 #           import json
+#           import io  (only for prepare_screenshot)
+#           import re  (only for numeric_tolerance)
+#           import hashlib, from dataclasses import dataclass  (only for ClassificationMemo)
 
+import hashlib
+import io
 import json
+import re
+from dataclasses import dataclass
 from genlayer import *
 
 
+# =============================================================================
+# Canonical JSON
+# =============================================================================
+#
+# strict_eq compares the leader's and validators' outputs as strings, so every
+# helper serializes its result canonically (sorted keys) and parses it again
+# after consensus. canonical_dumps uses the compact separator form, which
+# shrinks the compared payload and the stored result.
+
+
+def canonical_dumps(obj) -> str:
+    """Serialize to canonical JSON: sorted keys, no insignificant whitespace."""
+    return json.dumps(obj, sort_keys=True, separators=(",", ":"))
+
+
+def canonical_loads(raw: str):
+    """
+    Parse a consensus result produced by `canonical_dumps`. Same as
+    json.loads; it exists only for symmetry with `canonical_dumps`.
+    """
+    return json.loads(raw)
+
+
+# =============================================================================
+# Classification Memo
+# =============================================================================
+#
+# Reposted spam is classified again on every `moderate` call. Keep verdicts
+# in contract storage keyed by a hash of the normalized text, the prompt
+# template and the category set; a repeat is answered from storage without
+# entering the non-deterministic path. The memo is bounded: once `capacity`
+# verdicts are stored, each new one evicts the oldest (FIFO ring buffer).
+#
+#   class MyContract(gl.Contract):
+#       _verdict_memo: ClassificationMemo
+
+
+@allow_storage
+@dataclass
+class ClassificationMemo:
+    entries: TreeMap[str, str]  # key -> canonical JSON verdict
+    ring: DynArray[str]         # keys in insertion order, reused as slots
+    next_slot: u256             # ring slot overwritten by the next insert
+    hits: u256
+    misses: u256
+
+
+def classification_key(text: str, template: str, categories: list[str]) -> str:
+    """
+    Hash of the text (case and whitespace folded), the prompt template and
+    the category set. Changing the template or categories changes every
+    key, so stale verdicts are never returned for a new prompt.
+    """
+    normalized = " ".join(text.casefold().split())
+    payload = "\x00".join([normalized, template, "|".join(sorted(categories))])
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def memo_classify(
+    memo: ClassificationMemo,
+    text: str,
+    template: str,
+    categories: list[str],
+    classify_fn,
+    *,
+    capacity: int = 1024,
+) -> dict:
+    """
+    Return the stored verdict for this text, or run `classify_fn()` (which
+    performs the consensus round) and store its result.
+
+    Args:
+        memo: ClassificationMemo storage field
+        text: Input being classified
+        template: Prompt template identifying the classifier, e.g. the
+                  prompt built with a "{text}" placeholder
+        categories: Allowed categories
+        classify_fn: Zero-argument function returning the verdict dict
+        capacity: Maximum number of stored verdicts
+
+    Returns:
+        Verdict dict
+
+    Example:
+        template = classify_prompt("{text}", CATEGORIES, context=CONTEXT)
+        result = memo_classify(
+            self._verdict_memo, post.content, template, CATEGORIES,
+            lambda: llm_strict(classify_prompt(post.content, CATEGORIES, context=CONTEXT)),
+        )
+    """
+    key = classification_key(text, template, categories)
+    if key in memo.entries:
+        memo.hits += 1
+        return canonical_loads(memo.entries[key])
+
+    memo.misses += 1
+    result = classify_fn()
+    if len(memo.ring) < capacity:
+        memo.ring.append(key)
+    else:
+        slot = memo.next_slot % len(memo.ring)
+        evicted = memo.ring[slot]
+        if evicted in memo.entries:
+            del memo.entries[evicted]
+        memo.ring[slot] = key
+        memo.next_slot = (slot + 1) % len(memo.ring)
+    memo.entries[key] = canonical_dumps(result)
+    return result
+
+
+def memo_stats(memo: ClassificationMemo) -> dict:
+    """
+    Hit/miss counters and current size, for a view method. TreeMap has no
+    len(); every stored verdict occupies exactly one ring slot instead.
+    """
+    return {"hits": memo.hits, "misses": memo.misses, "size": len(memo.ring)}
+
+
 def web_llm_strict(
     url: str,
     prompt_template: str,
     *,
     mode: str = "text",
     response_format: str = "json",
+    region: tuple[int, int, int, int] | None = None,
+    max_dimension: int | None = None,
+    greyscale: bool = False,
+    image_quality: int | None = None,
 ) -> dict | str:
     """
     Fetch a web page, run an LLM prompt against it, and return the
@@ -26,11 +155,22 @@ def web_llm_strict(
     The prompt_template should contain a {web_data} placeholder that will
     be replaced with the fetched web content.
 
+    In "screenshot" mode the image is attached to the prompt instead of
+    being formatted into it, after being reduced with `prepare_screenshot`.
+    Image tokens scale with pixel area, so crop to the part of the page you
+    need and cap the size whenever you can.
+
     Args:
         url: URL to fetch
         prompt_template: Prompt string with {web_data} placeholder
         mode: "text", "html", or "screenshot"
         response_format: "json" or "text"
+        region: Screenshot only. (left, top, right, bottom) pixel box to crop
+                to, e.g. (0, 0, 1280, 800) for the first viewport or an
+                element's bounding box
+        max_dimension: Screenshot only. Downscale so neither side exceeds this
+        greyscale: Screenshot only. Convert to greyscale
+        image_quality: Screenshot only. Re-encode as JPEG at this quality (1-95)
 
     Returns:
         Parsed dict (if json) or str after strict_eq consensus
@@ -39,23 +179,238 @@ def web_llm_strict(
         prompt = "Fact-check this claim using the evidence.\\n{web_data}"
         result = web_llm_strict(url="https://example.com", prompt_template=prompt)
         # result is a dict like {"verdict": "true", "explanation": "..."}
+
+        # Only the price widget, small and greyscale
+        result = web_llm_strict(
+            url="https://example.com/ticker",
+            prompt_template="Read the price shown in the screenshot. {web_data}",
+            mode="screenshot",
+            region=(0, 120, 640, 360),
+            max_dimension=512,
+            greyscale=True,
+        )
     """
     def _inner() -> str:
         web_data = gl.nondet.web.render(url, mode=mode)
-        filled_prompt = prompt_template.format(web_data=web_data)
-        result = gl.nondet.exec_prompt(
-            filled_prompt, response_format=response_format
-        )
+        if mode == "screenshot":
+            image = prepare_screenshot(
+                web_data,
+                region=region,
+                max_dimension=max_dimension,
+                greyscale=greyscale,
+                quality=image_quality,
+            )
+            filled_prompt = prompt_template.format(web_data="(see attached screenshot)")
+            result = gl.nondet.exec_prompt(
+                filled_prompt, response_format=response_format, images=[image]
+            )
+        else:
+            filled_prompt = prompt_template.format(web_data=web_data)
+            result = gl.nondet.exec_prompt(
+                filled_prompt, response_format=response_format
+            )
         if isinstance(result, dict):
-            return json.dumps(result, sort_keys=True)
+            return canonical_dumps(result)
         return result
 
     raw = gl.eq_principle.strict_eq(_inner)
     if response_format == "json":
-        return json.loads(raw)
+        return canonical_loads(raw)
     return raw
 
 
+def web_llm_multi(url: str, prompts: dict, *, mode: str = "text") -> dict:
+    """
+    Run several prompts over one rendered page in a single non-deterministic
+    block: one render and one consensus round instead of one of each per
+    helper. Use when a write needs more than one answer from the same page,
+    e.g. classify it and then extract fields from it.
+
+    Each value in `prompts` is either a template with a {web_data}
+    placeholder, or a function `(web_data, results) -> str` that receives
+    the results of the prompts before it, so a later prompt can depend on
+    an earlier answer. Prompts run in dict order and must return JSON.
+
+    Args:
+        url: URL to fetch
+        prompts: {name: template or prompt function}
+        mode: "text" or "html"
+
+    Returns:
+        {name: parsed result} after strict_eq consensus
+
+    Example:
+        results = web_llm_multi(url, {
+            "kind": 'Is this page a "product" or an "article"? '
+                    'Respond as {{"kind": "..."}}.\n{web_data}',
+            "fields": lambda page, done: (
+                f"Extract the fields of this {done['kind']['kind']} as JSON.\n{page}"
+            ),
+        })
+        # results: {"kind": {"kind": "product"}, "fields": {...}}
+    """
+    def _inner() -> str:
+        web_data = gl.nondet.web.render(url, mode=mode)
+        results = {}
+        for name, prompt in prompts.items():
+            if callable(prompt):
+                filled_prompt = prompt(web_data, results)
+            else:
+                filled_prompt = prompt.format(web_data=web_data)
+            results[name] = gl.nondet.exec_prompt(filled_prompt, response_format="json")
+        return canonical_dumps(results)
+
+    return canonical_loads(gl.eq_principle.strict_eq(_inner))
+
+
+def prepare_screenshot(
+    image,
+    *,
+    region: tuple[int, int, int, int] | None = None,
+    max_dimension: int | None = None,
+    greyscale: bool = False,
+    quality: int | None = None,
+) -> bytes:
+    """
+    Crop, downscale and re-encode a screenshot before sending it to the LLM.
+    Call from inside a leader function, on the result of
+    `gl.nondet.web.render(url, mode="screenshot")`.
+
+    Operations are applied in a fixed order (crop, resize, greyscale,
+    encode) so every validator produces the same image from the same page.
+
+    Args:
+        image: Screenshot returned by render (gl.nondet.Image or raw bytes)
+        region: (left, top, right, bottom) pixel box; clipped to the image
+        max_dimension: Downscale so neither side exceeds this many pixels
+        greyscale: Convert to a single luminance channel
+        quality: JPEG quality (1-95). None keeps lossless PNG encoding
+
+    Returns:
+        Encoded image bytes, ready for exec_prompt(..., images=[...])
+    """
+    if quality is not None and not 1 <= quality <= 95:
+        raise Exception(f"JPEG quality must be between 1 and 95, got {quality}")
+    raw = image if isinstance(image, bytes) else image.raw
+    if region is None and max_dimension is None and not greyscale and quality is None:
+        return raw
+
+    import PIL.Image  # only needed when a screenshot is actually reduced
+
+    img = PIL.Image.open(io.BytesIO(raw))
+    if region is not None:
+        left, top, right, bottom = region
+        left, top = max(0, left), max(0, top)
+        right, bottom = min(img.width, right), min(img.height, bottom)
+        if right <= left or bottom <= top:
+            raise Exception(f"Screenshot region {region} is outside the {img.width}x{img.height} page")
+        img = img.crop((left, top, right, bottom))
+    if max_dimension is not None and max(img.width, img.height) > max_dimension:
+        scale = max_dimension / max(img.width, img.height)
+        size = (max(1, int(img.width * scale)), max(1, int(img.height * scale)))
+        img = img.resize(size, PIL.Image.LANCZOS)
+    if greyscale:
+        img = img.convert("L")
+
+    out = io.BytesIO()
+    if quality is not None:
+        if img.mode not in ("L", "RGB"):
+            img = img.convert("RGB")
+        img.save(out, format="JPEG", quality=quality)
+    else:
+        img.save(out, format="PNG", optimize=True)
+    return out.getvalue()
+
+
+def web_llm_map_reduce(
+    url: str,
+    map_prompt: str,
+    *,
+    combine_prompt: str | None = None,
+    reducer=None,
+    mode: str = "text",
+    chunk_size: int = 8000,
+    max_chunks: int = 8,
+) -> dict:
+    """
+    Fetch a page too long for one prompt, extract from each chunk, and
+    combine the partial results. Consensus is reached once, on the final
+    output: validators repeat the whole pipeline inside a single strict_eq
+    and no partial result is ever compared.
+
+    The page is split with `split_chunks`, so every validator sees the
+    same chunks for the same content. Pages longer than
+    `chunk_size * max_chunks` are cut off after the last chunk.
+
+    Args:
+        url: URL to fetch
+        map_prompt: Prompt with a {web_data} placeholder, run once per chunk;
+                    must return JSON
+        combine_prompt: Prompt with a {partials} placeholder receiving the
+                        JSON list of chunk results; must return JSON
+        reducer: Deterministic alternative to combine_prompt. Called as
+                 reducer(partials) -> dict, with no extra LLM call
+        mode: "text" or "html"
+        chunk_size: Maximum characters per chunk
+        max_chunks: Maximum number of chunks (and map prompts) per call
+
+    Returns:
+        Parsed dict after strict_eq consensus
+
+    Example:
+        result = web_llm_map_reduce(
+            url="https://example.com/annual-report",
+            map_prompt="List every risk factor in this excerpt as "
+                       '{{"risks": [...]}}.\n{web_data}',
+            reducer=lambda parts: {"risks": sorted({r for p in parts for r in p["risks"]})},
+            chunk_size=6000,
+            max_chunks=10,
+        )
+    """
+    if (combine_prompt is None) == (reducer is None):
+        raise Exception("Pass exactly one of combine_prompt or reducer")
+
+    def _inner() -> str:
+        web_data = gl.nondet.web.render(url, mode=mode)
+        partials = []
+        for chunk in split_chunks(web_data, chunk_size, max_chunks):
+            filled_prompt = map_prompt.format(web_data=chunk)
+            partials.append(gl.nondet.exec_prompt(filled_prompt, response_format="json"))
+        if reducer is not None:
+            result = reducer(partials)
+        else:
+            filled_prompt = combine_prompt.format(partials=canonical_dumps(partials))
+            result = gl.nondet.exec_prompt(filled_prompt, response_format="json")
+        return canonical_dumps(result)
+
+    return canonical_loads(gl.eq_principle.strict_eq(_inner))
+
+
+def split_chunks(text: str, chunk_size: int, max_chunks: int) -> list[str]:
+    """
+    Split text into at most `max_chunks` pieces of at most `chunk_size`
+    characters, preferring paragraph, then line, then word boundaries.
+    Depends only on the text, so it is safe inside a leader function.
+    """
+    if chunk_size <= 0 or max_chunks <= 0:
+        raise Exception("chunk_size and max_chunks must be positive")
+    chunks = []
+    start = 0
+    while start < len(text) and len(chunks) < max_chunks:
+        end = start + chunk_size
+        if end < len(text):
+            for sep in ("\n\n", "\n", " "):
+                cut = text.rfind(sep, start, end)
+                if cut > start:
+                    end = cut + len(sep)
+                    break
+        chunk = text[start:end].strip()
+        if chunk:
+            chunks.append(chunk)
+        start = end
+    return chunks
+
+
 def llm_strict(prompt: str, *, response_format: str = "json") -> dict | str:
     """
     Run an LLM prompt and get strict-equality consensus.
@@ -75,12 +430,12 @@ def llm_strict(prompt: str, *, response_format: str = "json") -> dict | str:
     def _inner() -> str:
         result = gl.nondet.exec_prompt(prompt, response_format=response_format)
         if isinstance(result, dict):
-            return json.dumps(result, sort_keys=True)
+            return canonical_dumps(result)
         return result
 
     raw = gl.eq_principle.strict_eq(_inner)
     if response_format == "json":
-        return json.loads(raw)
+        return canonical_loads(raw)
     return raw
 
 
@@ -120,6 +475,263 @@ def web_llm_comparative(
     return gl.eq_principle.prompt_comparative(_inner, principle)
 
 
+def web_llm_hybrid(
+    url: str,
+    prompt_template: str,
+    principle: str,
+    *,
+    mode: str = "text",
+    predicates: list = [],
+) -> str:
+    """
+    Like `web_llm_comparative`, but validators first try cheap deterministic
+    comparisons and only ask an LLM judge when those are inconclusive:
+
+      1. exact match
+      2. match after normalization (canonical JSON, or case/whitespace-folded text)
+      3. caller-supplied predicates, in order (see `numeric_tolerance`,
+         `same_key_points`)
+      4. LLM judgement against `principle`
+
+    In the common case (identical or trivially equal outputs) this saves
+    one model invocation per validator.
+
+    Args:
+        url: URL to fetch
+        prompt_template: Prompt string with {web_data} placeholder
+        principle: How to compare outputs when the LLM judge is needed
+        mode: "text", "html", or "screenshot"
+        predicates: Functions (leader_output: str, own_output: str) -> bool | None.
+                    True/False decide; None means inconclusive
+
+    Returns:
+        str result after consensus
+
+    Example:
+        result = web_llm_hybrid(
+            url="https://example.com/stock",
+            prompt_template='Give the price as JSON {{"price": <number>}}:\n{web_data}',
+            principle="Prices are equivalent if they differ by less than 1%",
+            predicates=[numeric_tolerance(0.01, field="price")],
+        )
+    """
+    def _leader() -> str:
+        web_data = gl.nondet.web.render(url, mode=mode)
+        filled_prompt = prompt_template.format(web_data=web_data)
+        return gl.nondet.exec_prompt(filled_prompt)
+
+    def _validator(leader_result) -> bool:
+        if not isinstance(leader_result, gl.vm.Return):
+            return False
+        return outputs_equivalent(leader_result.calldata, _leader(), principle, predicates)
+
+    return gl.vm.run_nondet(_leader, _validator)
+
+
+def outputs_equivalent(leader_output: str, own_output: str, principle: str, predicates: list = []) -> bool:
+    """
+    Decide whether two outputs are equivalent, using an LLM call only as
+    the last resort. See `web_llm_hybrid` for the order of checks.
+    Call from inside a validator function.
+    """
+    if leader_output == own_output:
+        return True
+    if _normalize_output(leader_output) == _normalize_output(own_output):
+        return True
+    for predicate in predicates:
+        verdict = predicate(leader_output, own_output)
+        if verdict is not None:
+            return bool(verdict)
+
+    judgement = gl.nondet.exec_prompt(
+        f"""Decide whether two outputs are equivalent under the given principle.
+
+PRINCIPLE: {principle}
+
+OUTPUT A:
+{leader_output}
+
+OUTPUT B:
+{own_output}
+
+Respond ONLY with this exact JSON format, nothing else:
+{{"equivalent": <true|false>}}""",
+        response_format="json",
+    )
+    return judgement.get("equivalent") in (True, "true", "yes")
+
+
+def numeric_tolerance(rel_tolerance: float, *, field: str | None = None):
+    """
+    Predicate for `web_llm_hybrid`: compare the numbers in both outputs.
+    Reads `field` from JSON outputs, or the first number in plain text.
+    Returns None (inconclusive) if either side has no number.
+    """
+    def _predicate(a: str, b: str) -> bool | None:
+        x, y = _extract_number(a, field), _extract_number(b, field)
+        if x is None or y is None:
+            return None
+        return abs(x - y) <= rel_tolerance * max(abs(x), abs(y))
+
+    return _predicate
+
+
+def same_key_points(field: str = "key_points"):
+    """
+    Predicate for `web_llm_hybrid`: accept when the JSON list at `field`
+    holds the same items on both sides (order, case and whitespace ignored).
+    Differing sets are left to the LLM judge, since phrasing may differ.
+    """
+    def _predicate(a: str, b: str) -> bool | None:
+        try:
+            x, y = json.loads(a).get(field), json.loads(b).get(field)
+        except (ValueError, AttributeError):
+            return None
+        if not isinstance(x, list) or not isinstance(y, list):
+            return None
+        if {_fold_text(str(i)) for i in x} == {_fold_text(str(i)) for i in y}:
+            return True
+        return None
+
+    return _predicate
+
+
+def _fold_text(text: str) -> str:
+    return " ".join(text.casefold().split()).rstrip(".")
+
+
+def _normalize_output(output: str) -> str:
+    try:
+        return canonical_dumps(json.loads(output))
+    except ValueError:
+        return _fold_text(output)
+
+
+def _extract_number(output: str, field: str | None) -> float | None:
+    if field is not None:
+        try:
+            output = str(json.loads(output)[field])
+        except (ValueError, KeyError, TypeError):
+            return None
+    match = re.search(r"-?\d+(?:\.\d+)?", output.replace(",", ""))
+    return float(match.group()) if match else None
+
+
+def leader_verified(leader_fn, check_fn) -> dict:
+    """
+    Run expensive work on the leader only and let validators accept it with
+    a cheap, caller-supplied check, instead of every validator repeating the
+    leader's render + LLM pipeline as with strict_eq.
+
+    Built on `gl.vm.run_nondet` with a custom leader/validator split. The
+    check should be deterministic given the web state (re-fetch one JSON
+    field, look for a quoted span on the page, ...). If it raises, the
+    validator rejects.
+
+    Args:
+        leader_fn: Zero-argument function doing the expensive extraction;
+                   returns a JSON-serializable dict
+        check_fn: Function (leader_result: dict) -> bool run by validators
+
+    Returns:
+        The leader's result dict, once validators accept it
+
+    Example:
+        def _extract():
+            page = gl.nondet.web.render(url, mode="text")
+            return gl.nondet.exec_prompt(extraction_prompt + page, response_format="json")
+
+        result = leader_verified(_extract, quote_on_page_check(url, "quote"))
+    """
+    def _leader() -> str:
+        return canonical_dumps(leader_fn())
+
+    def _validator(leader_result) -> bool:
+        if not isinstance(leader_result, gl.vm.Return):
+            return False
+        try:
+            return bool(check_fn(json.loads(leader_result.calldata)))
+        except Exception:
+            return False
+
+    return canonical_loads(gl.vm.run_nondet(_leader, _validator))
+
+
+def web_llm_verified(url: str, prompt_template: str, check_fn, *, mode: str = "text") -> dict:
+    """
+    `web_llm_strict` with validator-side verification: only the leader
+    renders the page and calls the LLM; validators run `check_fn` on the
+    leader's JSON result.
+
+    Args:
+        url: URL to fetch
+        prompt_template: Prompt string with {web_data} placeholder
+        check_fn: Function (leader_result: dict) -> bool, e.g. from
+                  `quote_on_page_check` or `json_field_check`
+        mode: "text" or "html"
+
+    Example:
+        prompt = (
+            "Extract the CEO's name and quote the sentence stating it.\n{web_data}\n"
+            'Respond ONLY with JSON: {{"ceo": "<name>", "quote": "<exact sentence>"}}'
+        )
+        result = web_llm_verified(url, prompt, quote_on_page_check(url, "quote"))
+    """
+    def _extract() -> dict:
+        web_data = gl.nondet.web.render(url, mode=mode)
+        return gl.nondet.exec_prompt(
+            prompt_template.format(web_data=web_data), response_format="json"
+        )
+
+    return leader_verified(_extract, check_fn)
+
+
+def quote_on_page_check(url: str, field: str, *, mode: str = "text"):
+    """
+    Build a validator check that re-renders `url` and accepts the leader's
+    result if `result[field]` appears on the page (whitespace-insensitive).
+    Costs one render per validator and no LLM call.
+    """
+    def _check(result: dict) -> bool:
+        quote = " ".join(str(result.get(field, "")).split())
+        if not quote:
+            return False
+        page = " ".join(gl.nondet.web.render(url, mode=mode).split())
+        return quote in page
+
+    return _check
+
+
+def json_field_check(
+    url: str,
+    path: str,
+    field: str,
+    *,
+    headers: dict = {},
+    rel_tolerance: float = 0.0,
+):
+    """
+    Build a validator check that re-fetches a JSON API and compares the
+    value at `path` (dot-separated, e.g. "bitcoin.usd") with `result[field]`.
+    Numbers match within `rel_tolerance`; anything else must be equal.
+    """
+    def _check(result: dict) -> bool:
+        resp = gl.nondet.web.get(url, headers=headers)
+        if resp.status != 200:
+            return False
+        value = json.loads(resp.body)
+        for part in path.split("."):
+            value = value[int(part)] if isinstance(value, list) else value[part]
+        claimed = result.get(field)
+        try:
+            expected, actual = float(value), float(claimed)
+        except (TypeError, ValueError):
+            return str(value) == str(claimed)
+        return abs(expected - actual) <= rel_tolerance * max(abs(expected), abs(actual))
+
+    return _check
+
+
 def exec_prompt_with_retry(prompt: str, *, response_format: str = "json", max_retries: int = 3) -> dict | str:
     """
     Run `gl.nondet.exec_prompt` with simple retry logic for transient failures.
@@ -137,7 +749,7 @@ def exec_prompt_with_retry(prompt: str, *, response_format: str = "json", max_re
         try:
             result = gl.nondet.exec_prompt(prompt, response_format=response_format)
             if isinstance(result, dict):
-                return json.dumps(result, sort_keys=True) if response_format == "json" else result
+                return canonical_dumps(result) if response_format == "json" else result
             return result
         except Exception as e:
             last_exc = e
@@ -169,7 +781,7 @@ def web_render_with_retry(url: str, *, mode: str = "text", max_retries: int = 3,
     raise last_exc
 
 
-def web_get_with_retry(url: str, *, headers: dict[str, str | bytes] = {}, max_retries: int = 3, timeout_per_attempt: int = 5) -> 'gl.nondet.web.Response':
+def web_get_with_retry(url: str, *, headers: dict[str, str | bytes] = {}, max_retries: int = 3, timeout_per_attempt: int = 5, revalidate: dict | None = None) -> 'gl.nondet.web.Response':
     """
     Wrapper around `gl.nondet.web.get()` with retry attempts.
 
@@ -178,7 +790,18 @@ def web_get_with_retry(url: str, *, headers: dict[str, str | bytes] = {}, max_re
     caller's intent but is advisory; this helper retries on exceptions
     upto `max_retries` times. Use with care inside equivalence leader
     functions.
+
+    Pass `revalidate` (a dict with optional "etag" / "last_modified" values
+    from a previous response) to send `If-None-Match` / `If-Modified-Since`
+    headers. The server may then answer `304 Not Modified` with an empty
+    body; callers are expected to reuse their stored result in that case.
     """
+    if revalidate:
+        headers = dict(headers)
+        if revalidate.get("etag"):
+            headers["If-None-Match"] = revalidate["etag"]
+        if revalidate.get("last_modified"):
+            headers["If-Modified-Since"] = revalidate["last_modified"]
     attempt = 0
     last_exc = None
     while attempt < max_retries:
@@ -200,14 +823,73 @@ def record_event_strict(event_table: 'TreeMap', event_name: str, topics: list[by
     to ensure validators agree on the produced event payload. Use this when
     you want emitted events to be part of the contract's deterministic
     output and validated by the equivalence principle.
+
+    The leader only produces the canonical payload; storage is written once,
+    after consensus. For several events per transaction prefer
+    `flush_event_buffer_strict`, which needs a single consensus round.
     """
+    record = {"topics": list(topics) if isinstance(topics, (list, tuple)) else [topics], "blob": blob}
+
     def _inner():
-        # Ensure array exists and append
-        arr = event_table.get_or_insert_default(event_name)
-        record = {"topics": list(topics) if isinstance(topics, (list, tuple)) else [topics], "blob": blob}
-        arr.append(record)
         # Return canonical JSON for strict equality checking
-        return json.dumps(record, sort_keys=True)
+        return canonical_dumps(_event_payload(record))
 
     raw = gl.eq_principle.strict_eq(_inner)
-    return json.loads(raw)
+    arr = event_table.get_or_insert_default(event_name)
+    arr.append({"seq": _next_event_seq(arr), **record})
+    return canonical_loads(raw)
+
+
+def flush_event_buffer_strict(event_table: 'TreeMap', buffer: dict) -> dict:
+    """
+    Flush events collected with `buffer_event` (see storage.py) after a
+    single strict-equality round over the whole batch, instead of one
+    round per event as with `record_event_strict`.
+
+    Args:
+        event_table: TreeMap[str, DynArray] used for indexing events
+        buffer: {event_name: [{"topics": ..., "blob": ...}, ...]}
+
+    Returns:
+        {event_name: [first_seq, last_seq]} for each flushed event name
+
+    Example:
+        events = {}
+        buffer_event(events, "Resolved", (claim_id.encode(),), verdict)
+        buffer_event(events, "Rewarded", (submitter.encode(),), 1)
+        flush_event_buffer_strict(self._events, events)
+    """
+    batch = {name: [_event_payload(e) for e in pending] for name, pending in buffer.items() if pending}
+
+    def _inner():
+        return canonical_dumps(batch)
+
+    gl.eq_principle.strict_eq(_inner)
+
+    flushed = {}
+    for event_name, pending in buffer.items():
+        if not pending:
+            continue
+        arr = event_table.get_or_insert_default(event_name)
+        first = _next_event_seq(arr)
+        arr.extend(
+            {"seq": first + i, "topics": e["topics"], "blob": e["blob"]}
+            for i, e in enumerate(pending)
+        )
+        flushed[event_name] = [first, first + len(pending) - 1]
+    buffer.clear()
+    return flushed
+
+
+def _event_payload(record: dict) -> dict:
+    # bytes topics are not JSON-serializable; compare them as hex
+    topics = [t.hex() if isinstance(t, bytes) else t for t in record["topics"]]
+    return {"topics": topics, "blob": record["blob"]}
+
+
+def _next_event_seq(arr) -> int:
+    # Same numbering as storage.append_indexed_event
+    n = len(arr)
+    if n == 0:
+        return 0
+    return arr[n - 1].get("seq", n - 1) + 1
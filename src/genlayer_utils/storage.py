@@ -5,10 +5,26 @@
 # counters. Copy the functions you need into your contract file.
 #
 # Requires: from genlayer import *
+#           import json  (only for the materialized view and versioned record helpers)
+#           from dataclasses import dataclass  (only for GroupAggregate / OHLCBucket)
+#           import datetime  (only for message_timestamp)
+#           import decimal  (only for to_fixed)
 
+import datetime
+import decimal
+import json
+from dataclasses import dataclass
 from genlayer import *
 
 
+# Canonical JSON; same as canonical_dumps in nondet.py, repeated here so this
+# module can be copied on its own.
+
+
+def _canonical_dumps(obj) -> str:
+    return json.dumps(obj, sort_keys=True, separators=(",", ":"))
+
+
 def treemap_paginate(
     data: TreeMap,
     offset: int = 0,
@@ -105,6 +121,92 @@ def address_map_to_dict(data: TreeMap) -> dict:
     return {k.as_hex: v for k, v in data.items()}
 
 
+def treemap_iter(data: TreeMap, offset: int = 0, *, key_transform=None):
+    """
+    Lazily yield (key, value) tuples from a TreeMap, starting at `offset`.
+    Nothing is materialized, so callers can stop at any point.
+
+    Args:
+        data: The TreeMap to iterate
+        offset: Number of entries to skip
+        key_transform: Optional function to transform keys
+
+    Example:
+        for addr, score in treemap_iter(self.reputation, key_transform=lambda a: a.as_hex):
+            ...
+    """
+    idx = 0
+    for k, v in data.items():
+        if idx < offset:
+            idx += 1
+            continue
+        yield (key_transform(k) if key_transform else k), v
+        idx += 1
+
+
+def treemap_export_chunk(
+    data: TreeMap,
+    cursor: int = 0,
+    *,
+    max_entries: int = 100,
+    max_bytes: int | None = None,
+    key_transform=None,
+) -> dict:
+    """
+    Export a TreeMap in bounded chunks instead of one giant response.
+    Stops at `max_entries` entries or once the JSON-encoded entries would
+    exceed `max_bytes`, and returns a continuation cursor.
+
+    The cursor is an entry offset; skipping to it costs O(cursor) iteration,
+    but no skipped entry is decoded into the response.
+
+    Args:
+        data: The TreeMap to export
+        cursor: Continuation cursor from the previous chunk (0 to start)
+        max_entries: Maximum entries per chunk
+        max_bytes: Optional budget for the encoded entries. A chunk always
+                   contains at least one entry so exports make progress
+        key_transform: Optional function to transform keys
+
+    Returns:
+        {"entries": [[key, value], ...], "next_cursor": int | None}
+        next_cursor is None when the export is complete
+
+    Example:
+        @gl.public.view
+        def export_reputation(self, cursor: int = 0) -> dict:
+            return treemap_export_chunk(
+                self.reputation, cursor, max_bytes=64_000,
+                key_transform=lambda a: a.as_hex,
+            )
+    """
+    entries = []
+    used = 0
+    position = cursor
+    for k, v in treemap_iter(data, cursor, key_transform=key_transform):
+        if len(entries) >= max_entries:
+            return {"entries": entries, "next_cursor": position}
+        if max_bytes is not None:
+            size = len(json.dumps([k, v], separators=(",", ":"), default=str))
+            if entries and used + size > max_bytes:
+                return {"entries": entries, "next_cursor": position}
+            used += size
+        entries.append([k, v])
+        position += 1
+    return {"entries": entries, "next_cursor": None}
+
+
+def address_map_export_chunk(data: TreeMap, cursor: int = 0, *, max_entries: int = 100, max_bytes: int | None = None) -> dict:
+    """
+    Chunked variant of `address_map_to_dict`: exports a TreeMap[Address, V]
+    with hex string keys. See `treemap_export_chunk`.
+    """
+    return treemap_export_chunk(
+        data, cursor, max_entries=max_entries, max_bytes=max_bytes,
+        key_transform=lambda addr: addr.as_hex,
+    )
+
+
 def increment_or_init(data: TreeMap, key, amount: int = 1) -> None:
     """
     Increment a value in a TreeMap, initializing to 0 if the key is absent.
@@ -126,6 +228,70 @@ def increment_or_init(data: TreeMap, key, amount: int = 1) -> None:
     data[key] = current + amount
 
 
+def leaderboard_increment(scores: TreeMap, top: DynArray, key, amount: int = 1, *, k: int = 20) -> None:
+    """
+    `increment_or_init` that also maintains a bounded, sorted top-K list
+    next to the score map, so ranked views never export the whole map.
+    Cost is O(K) per update.
+
+    Scores must only grow (as with reputation or points); a key whose score
+    drops is not demoted, since the next candidate is unknown without a scan.
+
+    Args:
+        scores: TreeMap[K, u256] of all scores
+        top: DynArray[K] holding the top keys, highest score first
+        key: The key to increment
+        amount: How much to add (default: 1)
+        k: Size of the leaderboard
+
+    Example:
+        # contract fields: reputation: TreeMap[Address, u256]
+        #                  top_contributors: DynArray[Address]
+        leaderboard_increment(self.reputation, self.top_contributors, submitter)
+    """
+    score = scores.get(key, 0) + amount
+    scores[key] = score
+
+    n = len(top)
+    pos = -1
+    for i in range(n):
+        if top[i] == key:
+            pos = i
+            break
+    if pos < 0:
+        if n < k:
+            top.append(key)
+            pos = n
+        elif n > 0 and score > scores[top[n - 1]]:
+            pos = n - 1
+        else:
+            return
+
+    # Move up past every entry with a lower score; ties keep the earlier entrant ahead
+    while pos > 0 and scores[top[pos - 1]] < score:
+        top[pos] = top[pos - 1]
+        pos -= 1
+    top[pos] = key
+
+
+def leaderboard_top(scores: TreeMap, top: DynArray, limit: int | None = None, *, key_transform=None) -> list:
+    """
+    Return the leaderboard as [key, score] pairs, highest first. O(K).
+
+    Example:
+        @gl.public.view
+        def get_top_contributors(self, limit: int = 20) -> list:
+            return leaderboard_top(self.reputation, self.top_contributors, limit,
+                                   key_transform=lambda a: a.as_hex)
+    """
+    n = len(top) if limit is None else min(limit, len(top))
+    entries = []
+    for i in range(n):
+        key = top[i]
+        entries.append([key_transform(key) if key_transform else key, scores[key]])
+    return entries
+
+
 def treemap_count(data: TreeMap) -> int:
     """
     Count the number of entries in a TreeMap.
@@ -148,26 +314,866 @@ def treemap_count(data: TreeMap) -> int:
     return count
 
 
-def append_indexed_event(event_table: TreeMap, event_name: str, topics: list[bytes] | tuple[bytes, ...], blob) -> None:
+# =============================================================================
+# Incremental Aggregates and Materialized Views
+# =============================================================================
+#
+# Views that iterate whole maps to build counts or totals do O(n) work on
+# every poll. Instead, update running aggregates on each write and read
+# them back in O(1):
+#
+#   class MyContract(gl.Contract):
+#       _stats: TreeMap[str, GroupAggregate]   # group -> running stats
+#       _views: TreeMap[str, str]              # view name -> serialized result
+
+
+@allow_storage
+@dataclass
+class GroupAggregate:
+    count: u256
+    total: u256
+    min: u256
+    max: u256
+
+
+def aggregate_add(aggregates: TreeMap, group: str, value: int = 0) -> None:
+    """
+    Fold a new value into a group's running count, sum, min and max.
+
+    Args:
+        aggregates: TreeMap[str, GroupAggregate]
+        group: Group key (e.g. a category or asset name)
+        value: Value to add (use 0 when only counting)
+
+    Example:
+        aggregate_add(self._stats, post.category)
+        aggregate_add(self._volume, asset, amount)
+    """
+    if group not in aggregates:
+        aggregates[group] = GroupAggregate(count=1, total=value, min=value, max=value)
+        return
+    agg = aggregates[group]
+    agg.count += 1
+    agg.total += value
+    if value < agg.min:
+        agg.min = value
+    if value > agg.max:
+        agg.max = value
+
+
+def aggregate_remove(aggregates: TreeMap, group: str, value: int = 0) -> None:
+    """
+    Remove a previously added value from a group's count and sum.
+    The group is deleted when its count reaches zero.
+
+    min and max cannot be un-applied without a scan, so they stay as bounds
+    over every value added while the group was non-empty.
+    """
+    if group not in aggregates:
+        return
+    agg = aggregates[group]
+    if agg.count <= 1:
+        del aggregates[group]
+        return
+    agg.count -= 1
+    agg.total -= value
+
+
+def aggregate_get(aggregates: TreeMap, group: str) -> dict:
+    """
+    Read a group's running stats as a plain dict. O(1).
+
+    Returns:
+        {"count": int, "sum": int, "min": int, "max": int}, all zero for
+        an unknown group
+    """
+    if group not in aggregates:
+        return {"count": 0, "sum": 0, "min": 0, "max": 0}
+    agg = aggregates[group]
+    return {"count": agg.count, "sum": agg.total, "min": agg.min, "max": agg.max}
+
+
+def view_cache_store(cache: TreeMap, name: str, value) -> None:
+    """
+    Serialize a view result once, at write time, so polling views can
+    return it without rebuilding. Call from write methods only.
+
+    Args:
+        cache: TreeMap[str, str] of view name -> JSON string
+        name: View name
+        value: JSON-serializable view result
+    """
+    cache[name] = _canonical_dumps(value)
+
+
+def view_cache_invalidate(cache: TreeMap, name: str) -> None:
+    """Drop a stored view result after a write that changes its inputs."""
+    if name in cache:
+        del cache[name]
+
+
+def view_cache_read(cache: TreeMap, name: str, build) -> str:
+    """
+    Return the stored JSON for a view, or build and serialize it when the
+    entry was invalidated. Views cannot write storage, so a rebuilt result
+    is not stored; refresh it with `view_cache_store` from a write method.
+
+    Args:
+        cache: TreeMap[str, str] of view name -> JSON string
+        name: View name
+        build: Zero-argument function computing the result from scratch
+
+    Returns:
+        JSON string of the view result
+
+    Example:
+        @gl.public.view
+        def get_all_prices_json(self) -> str:
+            return view_cache_read(self._views, "all_prices", self._build_all_prices)
+    """
+    if name in cache:
+        return cache[name]
+    return _canonical_dumps(build())
+
+
+# =============================================================================
+# Fixed-point Numbers
+# =============================================================================
+#
+# Store prices and other numeric LLM outputs as u256 scaled by 10**decimals
+# instead of decimal strings: "67500.42" with 8 decimals is 6750042000000.
+# Comparisons and aggregates become integer operations, and the value takes
+# one integer slot. Convert back with from_fixed only in views.
+
+U256_MAX = 2**256 - 1
+
+FIXED_ROUNDING = {
+    "down": decimal.ROUND_DOWN,
+    "up": decimal.ROUND_UP,
+    "half_up": decimal.ROUND_HALF_UP,
+    "half_even": decimal.ROUND_HALF_EVEN,
+}
+
+
+def to_fixed(value: str, decimals: int, *, rounding: str = "half_even") -> int:
+    """
+    Parse a decimal string into a u256 scaled by 10**decimals.
+
+    Thousands separators and surrounding whitespace are removed. Digits
+    beyond `decimals` are rounded with `rounding` ("down", "up", "half_up"
+    or "half_even"). Negative, non-finite and out-of-range values raise.
+
+    Example:
+        to_fixed("67,500.42", 8)               # 6750042000000
+        to_fixed("0.123456789", 8)             # 12345679
+        to_fixed("0.123456789", 8, rounding="down")  # 12345678
+    """
+    if rounding not in FIXED_ROUNDING:
+        raise Exception(f"Unknown rounding mode: {rounding}")
+    text = str(value).replace(",", "").strip()
+    try:
+        number = decimal.Decimal(text)
+    except decimal.InvalidOperation:
+        raise Exception(f"Not a decimal number: {value!r}")
+    if not number.is_finite() or number < 0:
+        raise Exception(f"Expected a non-negative finite number, got {value!r}")
+    if number and number.adjusted() + decimals > 78:
+        raise Exception(f"{value!r} does not fit in u256 with {decimals} decimals")
+    with decimal.localcontext() as ctx:
+        ctx.prec = 100
+        scaled = int(number.scaleb(decimals).quantize(decimal.Decimal(1), rounding=FIXED_ROUNDING[rounding]))
+    if scaled > U256_MAX:
+        raise Exception(f"{value!r} does not fit in u256 with {decimals} decimals")
+    return scaled
+
+
+def from_fixed(value: int, decimals: int, *, places: int | None = None) -> str:
+    """
+    Format a scaled integer as a decimal string for views.
+    Trailing zeros are dropped unless `places` fixes the number of
+    fractional digits (extra digits are truncated).
+
+    Example:
+        from_fixed(6750042000000, 8)            # "67500.42"
+        from_fixed(6750042000000, 8, places=4)  # "67500.4200"
+    """
+    whole, frac = divmod(int(value), 10**decimals)
+    digits = str(frac).rjust(decimals, "0") if decimals > 0 else ""
+    if places is None:
+        digits = digits.rstrip("0")
+    else:
+        digits = digits[:places].ljust(places, "0")
+    return f"{whole}.{digits}" if digits else str(whole)
+
+
+def fixed_mul(a: int, b: int, decimals: int) -> int:
+    """Multiply two values with the same scale. Rounds down."""
+    return a * b // 10**decimals
+
+
+def fixed_div(a: int, b: int, decimals: int) -> int:
+    """Divide two values with the same scale. Rounds down."""
+    if b == 0:
+        raise Exception("Division by zero")
+    return a * 10**decimals // b
+
+
+def fixed_rescale(value: int, from_decimals: int, to_decimals: int) -> int:
+    """Change the scale of a value. Rounds down when reducing decimals."""
+    if to_decimals >= from_decimals:
+        return value * 10 ** (to_decimals - from_decimals)
+    return value // 10 ** (from_decimals - to_decimals)
+
+
+# =============================================================================
+# Time Series (OHLC buckets)
+# =============================================================================
+#
+# Append timestamped samples and roll them up into fixed-width OHLC buckets.
+# Each series is a DynArray[OHLCBucket] ordered by bucket start, so point
+# and range queries are binary searches. A series keeps at least the latest
+# `max_buckets` buckets and never more than `2 * max_buckets - 1`.
+#
+#   class MyContract(gl.Contract):
+#       _history: TreeMap[str, DynArray[OHLCBucket]]   # "<name>:<resolution>" -> buckets
+
+
+TIMESERIES_RESOLUTIONS = {"1m": 60, "1h": 3600, "1d": 86400}
+
+
+@allow_storage
+@dataclass
+class OHLCBucket:
+    start: u256
+    open: u256
+    high: u256
+    low: u256
+    close: u256
+    count: u256
+
+
+def message_timestamp() -> int:
+    """
+    Current transaction time as integer Unix seconds.
+    Deterministic: every validator sees the same message datetime.
+    """
+    raw = gl.message_raw["datetime"].replace("Z", "+00:00")
+    return int(datetime.datetime.fromisoformat(raw).timestamp())
+
+
+def timeseries_append(
+    series: DynArray,
+    timestamp: int,
+    value: int,
+    bucket_seconds: int,
+    *,
+    max_buckets: int = 1000,
+) -> None:
+    """
+    Add a sample to an OHLC series.
+
+    Samples in the current (latest) bucket update high/low/close; a later
+    timestamp opens a new bucket. A late sample for an older bucket only
+    widens that bucket's high/low; a late sample with no bucket to land in
+    (a gap, or older than the retained history) is rejected.
+
+    Old buckets are dropped in batches once the series holds twice
+    `max_buckets`, keeping appends amortized O(1).
+
+    Args:
+        series: DynArray[OHLCBucket] for one name and resolution
+        timestamp: Sample time in Unix seconds
+        value: Sample value (scaled integer, e.g. a fixed-point price)
+        bucket_seconds: Bucket width, e.g. 3600 for hourly buckets
+        max_buckets: Minimum number of most recent buckets to retain
+    """
+    start = timestamp - timestamp % bucket_seconds
+    n = len(series)
+    if n == 0 or start > series[n - 1].start:
+        series.append(OHLCBucket(start=start, open=value, high=value, low=value, close=value, count=1))
+        if len(series) >= 2 * max_buckets:
+            _timeseries_compact(series, max_buckets)
+        return
+
+    idx = _timeseries_search(series, start)
+    if idx < 0 or series[idx].start != start:
+        raise Exception(f"Out-of-order sample at {timestamp} has no bucket to update")
+    bucket = series[idx]
+    if value > bucket.high:
+        bucket.high = value
+    if value < bucket.low:
+        bucket.low = value
+    if idx == n - 1:
+        bucket.close = value
+    bucket.count += 1
+
+
+def timeseries_record(
+    history: TreeMap,
+    name: str,
+    timestamp: int,
+    value: int,
+    *,
+    resolutions: dict = TIMESERIES_RESOLUTIONS,
+    max_buckets: int = 1000,
+) -> None:
+    """
+    Append a sample to every resolution of a named series, e.g.
+    "BTC:1m", "BTC:1h" and "BTC:1d".
+
+    Args:
+        history: TreeMap[str, DynArray[OHLCBucket]]
+        name: Series name (e.g. asset symbol)
+        timestamp: Sample time in Unix seconds
+        value: Sample value
+        resolutions: {label: bucket_seconds}
+        max_buckets: Buckets retained per resolution
+
+    Example:
+        timeseries_record(self._history, symbol, message_timestamp(), price)
+    """
+    for label, seconds in resolutions.items():
+        series = history.get_or_insert_default(f"{name}:{label}")
+        timeseries_append(series, timestamp, value, seconds, max_buckets=max_buckets)
+
+
+def timeseries_at(series: DynArray, timestamp: int) -> dict | None:
+    """
+    Return the latest bucket starting at or before `timestamp`, i.e. the
+    bucket whose close is the value "as of" that time. O(log n).
+
+    Returns:
+        Bucket as a dict, or None if the series starts after `timestamp`
+    """
+    idx = _timeseries_search(series, timestamp)
+    if idx < 0:
+        return None
+    return _bucket_to_dict(series[idx])
+
+
+def timeseries_range(series: DynArray, start: int, end: int, limit: int = 500) -> list:
+    """
+    Return buckets whose start lies in [start, end], oldest first.
+    Cost is O(log n + results).
+
+    Example:
+        @gl.public.view
+        def get_daily_range(self, symbol: str, start: int, end: int) -> list:
+            return timeseries_range(self._history[f"{symbol}:1d"], start, end)
+    """
+    idx = _timeseries_search(series, start)
+    if idx < 0 or series[idx].start < start:
+        idx += 1
+    items = []
+    n = len(series)
+    while idx < n and len(items) < limit:
+        bucket = series[idx]
+        if bucket.start > end:
+            break
+        items.append(_bucket_to_dict(bucket))
+        idx += 1
+    return items
+
+
+def _timeseries_search(series: DynArray, timestamp: int) -> int:
+    """Index of the last bucket with start <= timestamp, or -1."""
+    lo, hi = 0, len(series)
+    while lo < hi:
+        mid = (lo + hi) // 2
+        if series[mid].start <= timestamp:
+            lo = mid + 1
+        else:
+            hi = mid
+    return lo - 1
+
+
+def _timeseries_compact(series: DynArray, keep: int) -> None:
+    n = len(series)
+    drop = n - keep
+    for i in range(keep):
+        series[i] = series[i + drop]
+    for _ in range(drop):
+        series.pop()
+
+
+def _bucket_to_dict(bucket) -> dict:
+    return {
+        "start": bucket.start, "open": bucket.open, "high": bucket.high,
+        "low": bucket.low, "close": bucket.close, "count": bucket.count,
+    }
+
+
+# =============================================================================
+# Append-only Collections (integer ids over DynArray)
+# =============================================================================
+#
+# Replaces the `u256` counter + f"prop_{n}" string id + TreeMap[str, Record]
+# pattern. A record's id is its position in a DynArray: no string formatting,
+# O(1) access by id, and pagination by id range instead of by offset.
+# Deleted ids are tombstoned, never reused.
+#
+#   class MyContract(gl.Contract):
+#       proposals: DynArray[Proposal]
+#       _deleted_proposals: TreeMap[u256, bool]   # tombstones
+
+
+def collection_append(items: DynArray, record) -> int:
+    """
+    Append a record and return its id.
+
+    Example:
+        proposal_id = collection_append(self.proposals, Proposal(...))
+    """
+    items.append(record)
+    return len(items) - 1
+
+
+def collection_get(items: DynArray, deleted: TreeMap, item_id: int):
+    """
+    Return the record with `item_id`. O(1).
+    Raises if the id was never issued or has been deleted.
+    """
+    if item_id < 0 or item_id >= len(items) or item_id in deleted:
+        raise Exception(f"Record {item_id} not found")
+    return items[item_id]
+
+
+def collection_delete(items: DynArray, deleted: TreeMap, item_id: int, *, empty=None) -> None:
+    """
+    Tombstone a record. Pass `empty` (a blank record of the same type) to
+    compact it immediately by overwriting its payload, so large fields
+    such as text stop taking space. Ids are never reused.
+    """
+    collection_get(items, deleted, item_id)
+    deleted[item_id] = True
+    if empty is not None:
+        items[item_id] = empty
+
+
+def collection_compact(items: DynArray, deleted: TreeMap, empty, cursor: int = 0, max_steps: int = 100) -> int | None:
+    """
+    Resumable sweep that overwrites tombstoned records with `empty`, for
+    records deleted without it. Processes at most `max_steps` tombstones
+    per call.
+
+    Returns:
+        Cursor for the next call, or None when the sweep is complete
+    """
+    steps = 0
+    position = 0
+    for item_id, _ in deleted.items():
+        if position < cursor:
+            position += 1
+            continue
+        if steps >= max_steps:
+            return position
+        items[item_id] = empty
+        steps += 1
+        position += 1
+    return None
+
+
+def collection_page(items: DynArray, deleted: TreeMap, start_id: int = 0, limit: int = 10) -> dict:
+    """
+    Return up to `limit` live records with id >= `start_id`, skipping
+    tombstones. Cost is O(limit + tombstones skipped), independent of
+    `start_id`.
+
+    Returns:
+        {"items": [[id, record], ...], "next_id": int | None}
+
+    Example:
+        @gl.public.view
+        def get_proposals(self, start_id: int = 0) -> dict:
+            page = collection_page(self.proposals, self._deleted_proposals, start_id, 10)
+            page["items"] = [{"id": i, "title": p.title} for i, p in page["items"]]
+            return page
+    """
+    n = len(items)
+    item_id = max(0, start_id)
+    entries = []
+    while item_id < n and len(entries) < limit:
+        if item_id not in deleted:
+            entries.append([item_id, items[item_id]])
+        item_id += 1
+    return {"items": entries, "next_id": item_id if item_id < n else None}
+
+
+def collection_import(items: DynArray, source: TreeMap, cursor: int = 0, limit: int = 100, *, id_map: TreeMap | None = None) -> int | None:
+    """
+    Migrate records from a string-keyed TreeMap into a collection, in
+    resumable batches of `limit`. With `id_map` (TreeMap[str, u256]) the
+    old key -> new id mapping is kept so legacy ids still resolve.
+
+    TreeMap order is by key ("prop_10" sorts before "prop_2"), so new ids
+    do not follow the old counter; use `id_map` rather than parsing ids.
+
+    Returns:
+        Cursor for the next call, or None when every record is imported
+
+    Example:
+        @gl.public.write
+        def migrate(self, cursor: int = 0) -> int | None:
+            self._require_owner()
+            return collection_import(self.proposal_list, self.proposals, cursor,
+                                     id_map=self._legacy_ids)
+    """
+    position = 0
+    imported = 0
+    for key, record in source.items():
+        if position < cursor:
+            position += 1
+            continue
+        if imported >= limit:
+            return position
+        new_id = collection_append(items, record)
+        if id_map is not None:
+            id_map[key] = new_id
+        imported += 1
+        position += 1
+    return None
+
+
+# =============================================================================
+# Versioned Records (lazy migration)
+# =============================================================================
+#
+# A storage dataclass cannot change shape under an upgradeable proxy without
+# rewriting every record in one transaction. Store records as JSON blobs
+# carrying a schema version in "_v" instead, and register one migration per
+# version step. A record is upgraded the first time it is read or written,
+# so an upgrade costs O(1) at deploy time; `versioned_sweep` can finish the
+# job in the background.
+#
+#   class MyContract(gl.Contract):
+#       users: TreeMap[str, str]   # key -> JSON record with "_v"
+#
+#   USER_VERSION = 2
+#   USER_MIGRATIONS = {
+#       0: lambda r: {**r, "display_name": r["name"]},        # 0 -> 1
+#       1: lambda r: {**r, "score": int(r.get("score", 0))},   # 1 -> 2
+#   }
+
+
+def migrate_record(record: dict, migrations: dict, version: int) -> tuple[dict, bool]:
+    """
+    Apply migrations until the record reaches `version`. Records without
+    "_v" are treated as version 0. `migrations[n]` maps a version-n record
+    to a version-(n+1) record; "_v" is set for it.
+
+    Returns:
+        (record, changed)
+    """
+    current = record.get("_v", 0)
+    if current > version:
+        raise Exception(f"Record version {current} is newer than supported version {version}")
+    changed = False
+    while current < version:
+        if current not in migrations:
+            raise Exception(f"No migration registered from version {current}")
+        record = migrations[current](dict(record))
+        current += 1
+        record["_v"] = current
+        changed = True
+    return record, changed
+
+
+def versioned_read(records: TreeMap, key: str, migrations: dict, version: int, *, write_back: bool = False) -> dict:
+    """
+    Load a record and return it at `version`. In write methods pass
+    `write_back=True` to persist the upgrade, so later reads skip the
+    migrations; views upgrade in memory only.
+
+    Example:
+        user = versioned_read(self.users, user_id, USER_MIGRATIONS, USER_VERSION)
+    """
+    if key not in records:
+        raise Exception(f"Record {key} not found")
+    record, changed = migrate_record(json.loads(records[key]), migrations, version)
+    if changed and write_back:
+        records[key] = _canonical_dumps(record)
+    return record
+
+
+def versioned_write(records: TreeMap, key: str, record: dict, version: int) -> None:
+    """Store a record stamped with `version`. The record must already have that shape."""
+    record = dict(record)
+    record["_v"] = version
+    records[key] = _canonical_dumps(record)
+
+
+def versioned_sweep(
+    records: TreeMap, migrations: dict, version: int, cursor: str | None = None, max_steps: int = 50
+) -> str | None:
+    """
+    Resumable background migration: visit up to `max_steps` records after
+    key `cursor` and write back the ones still on an old version. Call
+    repeatedly with the returned cursor (the last key visited) until it is
+    None. Because the cursor is a key, not a position, records inserted or
+    deleted between calls do not make the sweep skip anything. Records
+    written in between are already current and cost only a read.
+
+    Resuming still walks the keys before the cursor, so each call costs
+    O(cursor position + max_steps) reads.
+
+    Example:
+        @gl.public.write
+        def migrate_users(self, cursor: str | None = None) -> str | None:
+            self._require_owner()
+            return versioned_sweep(self.users, USER_MIGRATIONS, USER_VERSION, cursor)
+    """
+    if max_steps < 1:
+        raise Exception("max_steps must be at least 1")
+    steps = 0
+    last_key = cursor
+    updates = []
+    next_cursor = None
+    for key, raw in records.items():
+        if cursor is not None and key <= cursor:
+            continue
+        if steps >= max_steps:
+            next_cursor = last_key
+            break
+        record, changed = migrate_record(json.loads(raw), migrations, version)
+        if changed:
+            updates.append((key, record))
+        steps += 1
+        last_key = key
+    # Write after iterating so the TreeMap is not modified mid-iteration
+    for key, record in updates:
+        records[key] = _canonical_dumps(record)
+    return next_cursor
+
+
+# =============================================================================
+# Secondary Indexes (field value -> key set)
+# =============================================================================
+#
+# Keep a `TreeMap[str, TreeMap[str, bool]]` field next to your records and
+# update it on every insert, update and delete. Lookups by field value then
+# cost O(results) instead of a scan over every record.
+#
+#   class MyContract(gl.Contract):
+#       posts: TreeMap[str, Post]
+#       _post_index: TreeMap[str, TreeMap[str, bool]]
+
+
+def _index_bucket(field: str, value) -> str:
+    return f"{field}={value}"
+
+
+def index_add(index: TreeMap, field: str, value, key: str) -> None:
+    """
+    Add a record key to the index bucket for `field == value`.
+
+    Args:
+        index: TreeMap[str, TreeMap[str, bool]] holding the index
+        field: Indexed field name (e.g. "category")
+        value: Field value of the record
+        key: Record key in the primary TreeMap
+    """
+    index.get_or_insert_default(_index_bucket(field, value))[key] = True
+
+
+def index_discard(index: TreeMap, field: str, value, key: str) -> None:
+    """
+    Remove a record key from the index bucket for `field == value`.
+    Does nothing if the key is not indexed under that value.
+    """
+    bucket = _index_bucket(field, value)
+    if bucket in index and key in index[bucket]:
+        del index[bucket][key]
+
+
+def index_move(index: TreeMap, field: str, old_value, new_value, key: str) -> None:
+    """
+    Re-index a record whose field changed from `old_value` to `new_value`.
+    Call this after mutating a stored record in place.
+
+    Example:
+        old = post.category
+        post.category = result["category"]
+        index_move(self._post_index, "category", old, post.category, post_id)
+    """
+    if old_value == new_value:
+        return
+    index_discard(index, field, old_value, key)
+    index_add(index, field, new_value, key)
+
+
+def indexed_put(records: TreeMap, index: TreeMap, key: str, record, fields: list[str]) -> None:
+    """
+    Insert or replace a record and keep its secondary indexes in sync.
+
+    Args:
+        records: Primary TreeMap[str, Record]
+        index: TreeMap[str, TreeMap[str, bool]] holding the index
+        key: Record key
+        record: Record to store (dataclass or dict)
+        fields: Names of the indexed fields
+
+    Example:
+        indexed_put(self.posts, self._post_index, post_id, post, ["category"])
+    """
+    old = records[key] if key in records else None
+    for field in fields:
+        new_value = _field_value(record, field)
+        if old is None:
+            index_add(index, field, new_value, key)
+        else:
+            index_move(index, field, _field_value(old, field), new_value, key)
+    records[key] = record
+
+
+def indexed_delete(records: TreeMap, index: TreeMap, key: str, fields: list[str]) -> None:
+    """
+    Delete a record and remove it from its secondary indexes.
+    Does nothing if the key is absent.
+    """
+    if key not in records:
+        return
+    old = records[key]
+    for field in fields:
+        index_discard(index, field, _field_value(old, field), key)
+    del records[key]
+
+
+def index_lookup(index: TreeMap, field: str, value, offset: int = 0, limit: int = 100) -> list:
+    """
+    Return the keys of records whose `field == value`, paginated.
+    Cost is O(offset + limit), independent of the total number of records.
+
+    Args:
+        index: TreeMap[str, TreeMap[str, bool]] holding the index
+        field: Indexed field name
+        value: Field value to match
+        offset: Number of matching keys to skip
+        limit: Maximum number of keys to return
+
+    Returns:
+        List of record keys
+
+    Example:
+        @gl.public.view
+        def get_flagged(self, category: str) -> list:
+            keys = index_lookup(self._post_index, "category", category)
+            return [self.posts[k].content for k in keys]
+    """
+    bucket = _index_bucket(field, value)
+    if bucket not in index:
+        return []
+    keys = []
+    count = 0
+    for k in index[bucket]:
+        if count < offset:
+            count += 1
+            continue
+        if len(keys) >= limit:
+            break
+        keys.append(k)
+        count += 1
+    return keys
+
+
+def _field_value(record, field: str):
+    if isinstance(record, dict):
+        return record.get(field)
+    return getattr(record, field)
+
+
+def append_indexed_event(event_table: TreeMap, event_name: str, topics: list[bytes] | tuple[bytes, ...], blob) -> int:
     """
     Append an event record to an in-contract event index.
 
     Pattern: contracts that want queryable events keep a storage field like
     `self._events: TreeMap[str, DynArray[dict]]` where each event name maps to a
-    `DynArray` of event records: `{"topics": [...], "blob": ...}`.
+    `DynArray` of event records: `{"seq": n, "topics": [...], "blob": ...}`.
 
     This helper appends a record to that array so frontends can query
     event history via view methods.
 
+    Each record gets a per-event-name sequence number that increases by one
+    per event and never changes, even if old records are trimmed. Frontends
+    poll with `query_events_since` using the last sequence number they saw.
+
     Args:
         event_table: TreeMap[str, DynArray] stored on the contract instance
         event_name: name of the event (string)
         topics: list or tuple of indexed bytes values
         blob: encodable payload
+
+    Returns:
+        The sequence number assigned to the event
     """
     arr = event_table.get_or_insert_default(event_name)
+    seq = _next_event_seq(arr)
     # arr should be a DynArray of plain dicts
-    arr.append({"topics": topics, "blob": blob})
+    arr.append({"seq": seq, "topics": topics, "blob": blob})
+    return seq
+
+
+def _event_seq(arr, idx: int) -> int:
+    # Records written before sequence numbers existed use their position
+    return arr[idx].get("seq", idx)
+
+
+def _next_event_seq(arr) -> int:
+    n = len(arr)
+    if n == 0:
+        return 0
+    return _event_seq(arr, n - 1) + 1
+
+
+def buffer_event(buffer: dict, event_name: str, topics: list[bytes] | tuple[bytes, ...], blob) -> None:
+    """
+    Queue an event in a plain in-memory dict instead of writing it to
+    storage right away. Flush the buffer once at the end of the write
+    method with `flush_event_buffer`.
+
+    Args:
+        buffer: Plain dict local to the write method ({} to start)
+        event_name: name of the event (string)
+        topics: list or tuple of indexed bytes values
+        blob: encodable payload
+
+    Example:
+        @gl.public.write
+        def settle(self, trades: list) -> None:
+            events = {}
+            for trade in trades:
+                ...
+                buffer_event(events, "Trade", (trade["symbol"].encode(),), trade)
+            flush_event_buffer(self._events, events)
+    """
+    buffer.setdefault(event_name, []).append({"topics": topics, "blob": blob})
+
+
+def flush_event_buffer(event_table: TreeMap, buffer: dict) -> dict:
+    """
+    Write buffered events with one lookup and one batched append per event
+    name, assigning the same sequence numbers `append_indexed_event` would.
+    The buffer is emptied.
+
+    Args:
+        event_table: TreeMap[str, DynArray] used for indexing events
+        buffer: Dict filled by `buffer_event`
+
+    Returns:
+        {event_name: [first_seq, last_seq]} for each flushed event name
+    """
+    flushed = {}
+    for event_name, pending in buffer.items():
+        if not pending:
+            continue
+        arr = event_table.get_or_insert_default(event_name)
+        first = _next_event_seq(arr)
+        arr.extend(
+            {"seq": first + i, "topics": e["topics"], "blob": e["blob"]}
+            for i, e in enumerate(pending)
+        )
+        flushed[event_name] = [first, first + len(pending) - 1]
+    buffer.clear()
+    return flushed
 
 
 def query_indexed_events(event_table: TreeMap, event_name: str, offset: int = 0, limit: int = 100) -> list:
@@ -203,3 +1209,89 @@ def query_indexed_events(event_table: TreeMap, event_name: str, offset: int = 0,
             items.append(item)
             idx += 1
         return items
+
+
+def query_events_since(event_table: TreeMap, event_name: str, cursor: int = 0, limit: int = 100) -> dict:
+    """
+    Incremental polling: return events with sequence number >= `cursor`,
+    oldest first, plus the cursor to use on the next poll.
+
+    Sequence numbers are contiguous, so the start position is computed
+    directly from the first retained record. Each poll costs O(new events).
+
+    Args:
+        event_table: TreeMap[str, DynArray] used for indexing events
+        event_name: Name of event to query
+        cursor: First sequence number wanted (0 for the beginning)
+        limit: Maximum number of records to return
+
+    Returns:
+        {"events": [...], "next_cursor": int}. If `cursor` points before the
+        retained history, polling resumes at the oldest retained event.
+
+    Example:
+        @gl.public.view
+        def get_events_since(self, cursor: int) -> dict:
+            return query_events_since(self._events, "PriceUpdated", cursor)
+    """
+    if event_name not in event_table:
+        return {"events": [], "next_cursor": cursor}
+    arr = event_table[event_name]
+    n = len(arr)
+    if n == 0:
+        return {"events": [], "next_cursor": cursor}
+    start = max(0, cursor - _event_seq(arr, 0))
+    end = min(n, start + limit)
+    events = [arr[i] for i in range(start, end)]
+    next_cursor = _event_seq(arr, end - 1) + 1 if events else max(cursor, _next_event_seq(arr))
+    return {"events": events, "next_cursor": next_cursor}
+
+
+def query_events_before(event_table: TreeMap, event_name: str, cursor: int | None = None, limit: int = 100) -> dict:
+    """
+    Reverse paging: return events with sequence number < `cursor`, newest
+    first. Pass `cursor=None` for the newest page, then feed `next_cursor`
+    back in to walk towards older events.
+
+    Returns:
+        {"events": [...], "next_cursor": int | None}. next_cursor is None
+        once the oldest retained event has been returned.
+    """
+    if event_name not in event_table:
+        return {"events": [], "next_cursor": None}
+    arr = event_table[event_name]
+    n = len(arr)
+    if n == 0:
+        return {"events": [], "next_cursor": None}
+    end = n if cursor is None else min(n, max(0, cursor - _event_seq(arr, 0)))
+    start = max(0, end - limit)
+    events = [arr[i] for i in range(end - 1, start - 1, -1)]
+    next_cursor = _event_seq(arr, start) if start > 0 else None
+    return {"events": events, "next_cursor": next_cursor}
+
+
+def trim_indexed_events(event_table: TreeMap, event_name: str, keep: int) -> int:
+    """
+    Retention: drop the oldest records so at most `keep` remain. Sequence
+    numbers of the remaining records are unchanged, so frontend cursors
+    stay valid. At least one record is kept to carry the sequence forward.
+
+    Returns:
+        Number of records removed
+    """
+    if event_name not in event_table:
+        return 0
+    arr = event_table[event_name]
+    keep = max(1, keep)
+    n = len(arr)
+    drop = n - keep
+    if drop <= 0:
+        return 0
+    for i in range(keep):
+        record = arr[i + drop]
+        if "seq" not in record:
+            record = {**record, "seq": i + drop}
+        arr[i] = record
+    for _ in range(drop):
+        arr.pop()
+    return drop
@@ -7,19 +7,44 @@
 #
 # Requires: from genlayer import *
 #           import json
+#           import hashlib  (only for the fetch_json_api revalidation cache)
+#           import datetime, decimal  (only for update_policy)
 
+import datetime
+import decimal
+import hashlib
 import json
 from genlayer import *
 
 
-def fetch_json_api(url: str, *, headers: dict = {}) -> dict:
+# Canonical JSON; same as canonical_dumps / canonical_loads in nondet.py,
+# repeated here so this module can be copied on its own.
+
+
+def _canonical_dumps(obj) -> str:
+    return json.dumps(obj, sort_keys=True, separators=(",", ":"))
+
+
+def _canonical_loads(raw: str):
+    return json.loads(raw)
+
+
+def fetch_json_api(url: str, *, headers: dict = {}, cache: TreeMap | None = None) -> dict:
     """
     Fetch a JSON API endpoint with strict equality consensus.
     Handles the full non-deterministic block pattern for REST API calls.
 
+    Pass a `cache` (a `TreeMap[str, str]` field on your contract) to enable
+    HTTP revalidation for endpoints you poll often. The cache stores the
+    ETag / Last-Modified validators and the last canonical result per URL.
+    Requests then carry conditional headers, and a `304 Not Modified` or a
+    byte-identical body reuses the stored result without re-parsing.
+
     Args:
         url: API endpoint URL
         headers: Optional HTTP headers (e.g., for API keys)
+        cache: Optional TreeMap[str, str] used as a revalidation cache.
+               Only use it from write methods, since it is updated in place.
 
     Returns:
         Parsed dict from the API response
@@ -27,15 +52,80 @@ def fetch_json_api(url: str, *, headers: dict = {}) -> dict:
     Example:
         data = fetch_json_api("https://api.example.com/data")
         price = data["price"]
+
+        # With a revalidation cache (contract field: _api_cache: TreeMap[str, str])
+        data = fetch_json_api("https://api.example.com/data", cache=self._api_cache)
     """
-    def _inner() -> str:
-        resp = gl.nondet.web.get(url, headers=headers)
-        if resp.status != 200:
-            raise Exception(f"API returned status {resp.status}")
-        data = json.loads(resp.body)
-        return json.dumps(data, sort_keys=True)
+    if cache is None:
+        def _inner() -> str:
+            resp = gl.nondet.web.get(url, headers=headers)
+            if resp.status != 200:
+                raise Exception(f"API returned status {resp.status}")
+            return _canonical_dumps(json.loads(resp.body))
+
+        return _canonical_loads(gl.eq_principle.strict_eq(_inner))
+
+    # Read the stored entry outside the non-deterministic block
+    entry = json.loads(cache[url]) if url in cache else None
+
+    def _leader() -> str:
+        return _canonical_dumps(_revalidate_json(url, headers, entry))
+
+    def _validator(leader_result) -> bool:
+        if not isinstance(leader_result, gl.vm.Return):
+            return False
+        leader_entry = json.loads(leader_result.calldata)
+        # Validators may see different ETags from different edge servers,
+        # so only the canonical data has to match.
+        return _revalidate_json(url, headers, entry)["data"] == leader_entry["data"]
 
-    return json.loads(gl.eq_principle.strict_eq(_inner))
+    raw = gl.vm.run_nondet(_leader, _validator)
+    new_entry = _canonical_loads(raw)
+    if new_entry != entry:
+        cache[url] = raw
+    return _canonical_loads(new_entry["data"])
+
+
+def _revalidate_json(url: str, headers: dict, entry: dict | None) -> dict:
+    """
+    Conditional GET used by `fetch_json_api` when a cache is supplied.
+    Returns a cache entry: {"etag", "last_modified", "body_hash", "data"}
+    where "data" is the canonical JSON string of the response body.
+    """
+    request_headers = dict(headers)
+    if entry is not None:
+        if entry["etag"]:
+            request_headers["If-None-Match"] = entry["etag"]
+        if entry["last_modified"]:
+            request_headers["If-Modified-Since"] = entry["last_modified"]
+
+    resp = gl.nondet.web.get(url, headers=request_headers)
+    if resp.status == 304 and entry is not None:
+        return entry
+    if resp.status != 200:
+        raise Exception(f"API returned status {resp.status}")
+
+    body_hash = hashlib.sha256(resp.body).hexdigest()
+    if entry is not None and entry["body_hash"] == body_hash:
+        # Same bytes as last time: skip parsing and re-canonicalizing
+        data = entry["data"]
+    else:
+        data = _canonical_dumps(json.loads(resp.body))
+
+    return {
+        "etag": _header_value(resp.headers, "etag"),
+        "last_modified": _header_value(resp.headers, "last-modified"),
+        "body_hash": body_hash,
+        "data": data,
+    }
+
+
+def _header_value(headers: dict, name: str) -> str:
+    """Case-insensitive response header lookup; returns "" when absent."""
+    for key, value in headers.items():
+        if key.lower() == name:
+            return value.decode("utf-8") if isinstance(value, bytes) else value
+    return ""
 
 
 def fetch_and_extract(
@@ -72,10 +162,10 @@ def fetch_and_extract(
         prompt = extraction_prompt.format(web_data=web_data)
         result = gl.nondet.exec_prompt(prompt, response_format="json")
         if isinstance(result, dict):
-            return json.dumps(result, sort_keys=True)
+            return _canonical_dumps(result)
         return result
 
-    return json.loads(gl.eq_principle.strict_eq(_inner))
+    return _canonical_loads(gl.eq_principle.strict_eq(_inner))
 
 
 def fetch_price(url: str, asset_name: str) -> dict:
@@ -103,7 +193,7 @@ WEB CONTENT:
 {{web_data}}
 
 Respond ONLY with this exact JSON format, nothing else:
-{{"price": "<numeric value as string>", "currency": "<USD|EUR|GBP|etc>", "timestamp": "<if available, otherwise unknown>"}}
+{{{{"price": "<numeric value as string>", "currency": "<USD|EUR|GBP|etc>", "timestamp": "<if available, otherwise unknown>"}}}}
 
 Rules:
 - Extract only the most recent/current price
@@ -113,6 +203,163 @@ Rules:
     return fetch_and_extract(url, prompt)
 
 
+def fetch_prices(url: str, asset_names: list[str]) -> dict:
+    """
+    Extract the prices of several assets from one page in a single render,
+    prompt and consensus round. Use instead of calling `fetch_price` once
+    per asset on the same market-overview page.
+
+    Each entry is validated inside the leader function, so validators
+    compare already-cleaned values: prices must be positive numbers and
+    are normalized to plain decimal strings ("67,500.420" and "6.75004200e4"
+    both become "67500.42"), so validators reading the same number agree.
+    Assets that are missing from the page or fail validation map to None.
+
+    Args:
+        url: Web page containing the prices
+        asset_names: Assets to extract, e.g. ["Bitcoin", "Ethereum"]
+
+    Returns:
+        {asset_name: {"price": str, "currency": str} | None}
+
+    Example:
+        result = fetch_prices(
+            url="https://www.coingecko.com/",
+            asset_names=["Bitcoin", "Ethereum", "Solana"],
+        )
+        # result: {"Bitcoin": {"price": "67500.42", "currency": "USD"},
+        #          "Ethereum": {"price": "3400.1", "currency": "USD"},
+        #          "Solana": None}
+    """
+    names = sorted(set(asset_names))
+    if not names:
+        return {}
+    asset_list = "\n".join(f"- {name}" for name in names)
+
+    def _inner() -> str:
+        web_data = gl.nondet.web.render(url, mode="text")
+        prompt = f"""Extract the current price of each asset below from this web page.
+
+ASSETS:
+{asset_list}
+
+WEB CONTENT:
+{web_data}
+
+Respond ONLY with this exact JSON format, nothing else:
+{{"prices": {{"<asset name exactly as listed>": {{"price": "<numeric value as string>", "currency": "<USD|EUR|GBP|etc>"}}}}}}
+
+Rules:
+- Use the asset names exactly as listed above as keys
+- Use null for an asset whose price is not on the page
+- Extract only the most recent/current price
+- Your response must be valid JSON only, no extra text"""
+        result = gl.nondet.exec_prompt(prompt, response_format="json")
+        prices = result.get("prices", {}) if isinstance(result, dict) else {}
+        if not isinstance(prices, dict):
+            prices = {}
+        return _canonical_dumps({name: _clean_price_entry(prices.get(name)) for name in names})
+
+    return _canonical_loads(gl.eq_principle.strict_eq(_inner))
+
+
+def _clean_price_entry(entry) -> dict | None:
+    if not isinstance(entry, dict):
+        return None
+    price = str(entry.get("price", "")).replace(",", "").replace(" ", "")
+    try:
+        value = decimal.Decimal(price)
+    except decimal.InvalidOperation:
+        return None
+    if not value.is_finite() or not value > 0:
+        return None
+    currency = str(entry.get("currency") or "USD").strip().upper()
+    return {"price": format(value.normalize(), "f"), "currency": currency}
+
+
+def update_policy(
+    last_value: str | None,
+    last_checked: int,
+    fetch_fn,
+    *,
+    heartbeat: int,
+    deviation: str = "0",
+    field: str = "price",
+) -> dict:
+    """
+    Decide whether a stored feed value needs a fetch and a write, so both
+    scale with market movement rather than with how often the update
+    method is called.
+
+    - Fetch is skipped while the value was checked less than `heartbeat`
+      seconds ago.
+    - Write is skipped while the fetched value moved by no more than
+      `deviation` (relative, e.g. "0.005" for 0.5%) from `last_value`.
+
+    Values are compared as Decimal, so "67500.40" and "67500.4" are equal
+    and no float rounding is involved. Store "checked_at" whenever
+    "fetched" is True (a single integer) and rewrite the record only when
+    "changed" is True.
+
+    Args:
+        last_value: Stored value as a decimal string, or None if there is none
+        last_checked: Unix seconds of the last fetch (0 if never)
+        fetch_fn: Zero-argument function returning the new result dict,
+                  e.g. lambda: fetch_price(url, asset)
+        heartbeat: Minimum seconds between fetches
+        deviation: Minimum relative change that justifies a write
+        field: Key of the value in the dict returned by fetch_fn
+
+    Returns:
+        {"fetched": bool, "changed": bool, "reason": str,
+         "result": dict | None, "checked_at": int}
+        reason is "fresh" (fetch skipped), "within_deviation" (write
+        skipped), "first" or "deviation"
+
+    Example:
+        policy = update_policy(
+            record.price, record.checked_at,
+            lambda: fetch_price(url, asset),
+            heartbeat=300, deviation="0.005",
+        )
+        if policy["fetched"]:
+            record.checked_at = policy["checked_at"]
+        if policy["changed"]:
+            record.price = policy["result"]["price"]
+    """
+    now = _message_timestamp()
+    if last_value is not None and now - last_checked < heartbeat:
+        return {"fetched": False, "changed": False, "reason": "fresh", "result": None, "checked_at": last_checked}
+
+    result = fetch_fn()
+    new = _decimal_value(result[field])
+    if last_value is None:
+        reason = "first"
+    else:
+        old = _decimal_value(last_value)
+        moved = abs(new - old)
+        if moved == 0 or (old != 0 and moved / abs(old) <= decimal.Decimal(deviation)):
+            return {"fetched": True, "changed": False, "reason": "within_deviation", "result": result, "checked_at": now}
+        reason = "deviation"
+    return {"fetched": True, "changed": True, "reason": reason, "result": result, "checked_at": now}
+
+
+def _decimal_value(value) -> decimal.Decimal:
+    try:
+        number = decimal.Decimal(str(value).replace(",", "").strip())
+    except decimal.InvalidOperation:
+        raise Exception(f"Not a decimal value: {value!r}")
+    if not number.is_finite():
+        raise Exception(f"Not a decimal value: {value!r}")
+    return number
+
+
+def _message_timestamp() -> int:
+    # Same as message_timestamp in storage.py
+    raw = gl.message_raw["datetime"].replace("Z", "+00:00")
+    return int(datetime.datetime.fromisoformat(raw).timestamp())
+
+
 def fetch_score(url: str, team1: str, team2: str) -> dict:
     """
     Fetch and extract a sports match score from a web source.
@@ -140,10 +387,104 @@ WEB CONTENT:
 {{web_data}}
 
 Respond ONLY with this exact JSON format, nothing else:
-{{"score": "<e.g. 2:1, or - if not played>", "winner": <0 for draw, 1 for {team1}, 2 for {team2}, -1 if not played>, "status": "<finished|in_progress|not_started>"}}
+{{{{"score": "<e.g. 2:1, or - if not played>", "winner": <0 for draw, 1 for {team1}, 2 for {team2}, -1 if not played>, "status": "<finished|in_progress|not_started>"}}}}
 
 Rules:
 - Use -1 for winner if the match hasn't been played yet
 - Your response must be valid JSON only, no extra text"""
 
     return fetch_and_extract(url, prompt)
+
+
+# Same as fact_check_batch_prompt / validate_batch_verdicts in llm.py,
+# repeated here so this module can be copied on its own.
+
+
+def _fact_check_batch_prompt(claims: list[str], evidence: str, verdicts: list[str]) -> str:
+    v = "|".join(verdicts)
+    numbered = "\n".join(f"{i}. {claim}" for i, claim in enumerate(claims, start=1))
+
+    return f"""You are a fact-checker. Based on the evidence provided,
+determine for each numbered claim whether it is {" or ".join(verdicts)}.
+
+CLAIMS:
+{numbered}
+
+EVIDENCE:
+{evidence}
+
+Respond ONLY with this exact JSON format, nothing else:
+{{"results": [{{"claim": <claim number>, "verdict": "<{v}>", "explanation": "<brief 1 sentence explanation>"}}]}}
+
+Rules:
+- Include exactly one result per claim, in the same order as the claims
+- Base each verdict strictly on the provided evidence
+- Keep each explanation concise and factual
+- Your response must be valid JSON only, no extra text"""
+
+
+def _validate_batch_verdicts(result: dict, count: int, allowed: list[str]) -> bool:
+    results = result.get("results")
+    if not isinstance(results, list) or len(results) != count:
+        return False
+    for i, item in enumerate(results, start=1):
+        if not isinstance(item, dict) or item.get("claim") != i:
+            return False
+        if item.get("verdict") not in allowed:
+            return False
+    return True
+
+
+def fact_check_batch(
+    url: str,
+    claims: list[str],
+    *,
+    verdicts: list[str] | None = None,
+    mode: str = "text",
+) -> list[dict]:
+    """
+    Fact-check several claims against one source: render the page once,
+    judge every claim in one prompt, and reach consensus on the combined
+    verdict list. Validators must agree on the verdicts; explanations are
+    taken from the leader.
+
+    Args:
+        url: Source page cited by all the claims
+        claims: Claim texts
+        verdicts: Valid verdict labels (default: true/false/partially_true)
+        mode: "text" or "html"
+
+    Returns:
+        [{"verdict": str, "explanation": str}, ...] in the order of `claims`
+
+    Example:
+        results = fact_check_batch(
+            url="https://en.wikipedia.org/wiki/Python_(programming_language)",
+            claims=["Python was created in 1991", "Python is statically typed"],
+        )
+        # results: [{"verdict": "true", ...}, {"verdict": "false", ...}]
+    """
+    if verdicts is None:
+        verdicts = ["true", "false", "partially_true"]
+
+    def _judge() -> list:
+        web_data = gl.nondet.web.render(url, mode=mode)
+        prompt = _fact_check_batch_prompt(claims, web_data, verdicts)
+        result = gl.nondet.exec_prompt(prompt, response_format="json")
+        if not _validate_batch_verdicts(result, len(claims), verdicts):
+            raise Exception("LLM response does not cover every claim with a valid verdict")
+        return [
+            {"verdict": item["verdict"], "explanation": item.get("explanation", "")}
+            for item in result["results"]
+        ]
+
+    def _leader() -> str:
+        return _canonical_dumps(_judge())
+
+    def _validator(leader_result) -> bool:
+        if not isinstance(leader_result, gl.vm.Return):
+            return False
+        leader_verdicts = [item["verdict"] for item in json.loads(leader_result.calldata)]
+        return leader_verdicts == [item["verdict"] for item in _judge()]
+
+    return _canonical_loads(gl.vm.run_nondet(_leader, _validator))
@@ -0,0 +1,79 @@
+import os
+import sys
+import tempfile
+import unittest
+from types import SimpleNamespace
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from genlayer_utils.cassette import Cassette, CassetteMiss, request_key
+
+
+def make_gl(calls):
+    def render(url, mode="text"):
+        calls.append(("render", url, mode))
+        return f"<page {url} {mode}>"
+
+    def get(url, headers={}):
+        calls.append(("get", url))
+        return SimpleNamespace(status=200, headers={"etag": b'"v1"'}, body=b'{"price": 1}')
+
+    def exec_prompt(prompt, response_format="text"):
+        calls.append(("exec_prompt", prompt))
+        return {"answer": "yes"} if response_format == "json" else "yes"
+
+    return SimpleNamespace(
+        nondet=SimpleNamespace(web=SimpleNamespace(render=render, get=get), exec_prompt=exec_prompt)
+    )
+
+
+class TestCassette(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "cassettes", "example.json")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_record_then_replay_offline(self):
+        calls = []
+        gl = make_gl(calls)
+        with Cassette(self.path, mode="record").install(gl):
+            page = gl.nondet.web.render("https://example.com", mode="text")
+            resp = gl.nondet.web.get("https://api.example.com")
+            answer = gl.nondet.exec_prompt("Q?", response_format="json")
+        self.assertEqual(len(calls), 3)
+        self.assertTrue(os.path.exists(self.path))
+
+        calls.clear()
+        with Cassette(self.path, mode="replay").install(gl):
+            self.assertEqual(gl.nondet.web.render("https://example.com", mode="text"), page)
+            replayed = gl.nondet.web.get("https://api.example.com")
+            self.assertEqual(gl.nondet.exec_prompt("Q?", response_format="json"), answer)
+        self.assertEqual(calls, [])
+        self.assertEqual(replayed.status, resp.status)
+        self.assertEqual(replayed.body, resp.body)
+        self.assertEqual(replayed.headers["etag"], b'"v1"')
+
+    def test_replay_miss_raises(self):
+        gl = make_gl([])
+        with Cassette(self.path, mode="replay").install(gl):
+            with self.assertRaises(CassetteMiss):
+                gl.nondet.web.render("https://unrecorded.example.com")
+
+    def test_uninstall_restores_originals(self):
+        gl = make_gl([])
+        original = gl.nondet.web.render
+        with Cassette(self.path, mode="replay").install(gl):
+            self.assertIsNot(gl.nondet.web.render, original)
+        self.assertIs(gl.nondet.web.render, original)
+
+    def test_request_key_depends_on_arguments(self):
+        a = request_key("render", ("https://example.com",), {"mode": "text"})
+        b = request_key("render", ("https://example.com",), {"mode": "html"})
+        self.assertNotEqual(a, b)
+        self.assertEqual(a, request_key("render", ("https://example.com",), {"mode": "text"}))
+
+
+if __name__ == '__main__':
+    unittest.main()
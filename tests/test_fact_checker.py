@@ -4,6 +4,8 @@
 #
 # These tests deploy the fact_checker.py example and verify
 # the core flow: submit a claim, resolve it with AI, check results.
+# tests/test_fact_checker_direct.py covers resolve_claim and
+# resolve_pending_claims offline.
 
 from gltest import get_contract_factory, default_account
 from gltest.helpers import load_fixture
@@ -62,6 +64,50 @@ def test_resolve_claim():
     assert len(claim["explanation"]) > 0
 
 
+def test_get_top_contributors():
+    """Test that resolving a claim ranks its submitter on the leaderboard."""
+    contract = load_fixture(deploy_contract)
+
+    contract.submit_claim(
+        args=[
+            "Python was created by Guido van Rossum",
+            "https://en.wikipedia.org/wiki/Python_(programming_language)",
+        ]
+    )
+    result = contract.resolve_claim(
+        args=["claim_1"],
+        wait_interval=10000,
+        wait_retries=15,
+    )
+    assert tx_execution_succeeded(result)
+
+    top = contract.get_top_contributors(args=[])
+    assert len(top) == 1
+    assert top[0][1] == 1
+
+
+def test_resolve_pending_claims():
+    """Test resolving several claims that cite one source in a single batch."""
+    contract = load_fixture(deploy_contract)
+
+    source = "https://en.wikipedia.org/wiki/Python_(programming_language)"
+    contract.submit_claim(args=["Python was created by Guido van Rossum", source])
+    contract.submit_claim(args=["Python was first released in 1991", source])
+
+    result = contract.resolve_pending_claims(
+        args=[],
+        wait_interval=10000,
+        wait_retries=15,
+    )
+    assert tx_execution_succeeded(result)
+
+    for claim_id in ["claim_1", "claim_2"]:
+        claim = contract.get_claim(args=[claim_id])
+        assert claim["is_resolved"] == True
+        assert claim["verdict"] in ["true", "false", "partially_true"]
+    assert contract.get_claims_by_verdict(args=["pending"]) == []
+
+
 def test_get_all_claims():
     """Test listing all claims."""
     contract = load_fixture(deploy_contract)
@@ -73,6 +119,19 @@ def test_get_all_claims():
     assert len(claims) == 2
 
 
+def test_get_claims_by_verdict():
+    """Test filtering claims through the verdict index."""
+    contract = load_fixture(deploy_contract)
+
+    contract.submit_claim(args=["Claim one", "https://example.com"])
+    contract.submit_claim(args=["Claim two", "https://example.com"])
+    contract.delete_claim(args=["claim_1"])
+
+    pending = contract.get_claims_by_verdict(args=["pending"])
+    assert [c["id"] for c in pending] == ["claim_2"]
+    assert contract.get_claims_by_verdict(args=["true"]) == []
+
+
 def test_owner_delete():
     """Test that the owner can delete claims."""
     contract = load_fixture(deploy_contract)
@@ -0,0 +1,67 @@
+# Test: Fact Checker example contract, offline
+#
+# Run with: pytest tests/test_fact_checker_direct.py (needs genlayer-test >= 0.29,
+# no Studio and no network)
+#
+# Runs fact_checker.py in-process with the gltest direct-mode runner and serves
+# every web render and LLM call from tests/cassettes/fact_checker.json. The
+# fixture holds a trimmed snapshot of the Wikipedia article and the model's
+# JSON answers. A prompt change makes the replay raise CassetteMiss; re-record
+# the entry with GENLAYER_CASSETTE=record where gl.nondet reaches live services.
+
+import os
+import sys
+
+import pytest
+
+pytest.importorskip("gltest.direct")
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from genlayer_utils.cassette import Cassette
+
+ROOT = os.path.join(os.path.dirname(__file__), "..")
+CONTRACT = os.path.join(ROOT, "examples", "fact_checker.py")
+CASSETTE = os.path.join(os.path.dirname(__file__), "cassettes", "fact_checker.json")
+
+SOURCE_URL = "https://en.wikipedia.org/wiki/Python_(programming_language)"
+
+
+@pytest.fixture
+def checker(direct_deploy):
+    contract = direct_deploy(CONTRACT)
+    # The SDK is imported by the deploy, so patch its gl namespace afterwards
+    import genlayer
+
+    with Cassette(CASSETTE).install(genlayer.gl):
+        yield contract
+
+
+def test_resolve_claim(checker):
+    """Test resolving one claim and ranking its submitter."""
+    checker.submit_claim("Python was created by Guido van Rossum", SOURCE_URL)
+    checker.resolve_claim("claim_1")
+
+    claim = checker.get_claim("claim_1")
+    assert claim["is_resolved"] == True
+    assert claim["verdict"] == "true"
+    assert len(claim["explanation"]) > 0
+
+    top = checker.get_top_contributors()
+    assert len(top) == 1
+    assert top[0][1] == 1
+
+
+def test_resolve_pending_claims(checker):
+    """Test resolving several claims that cite one source in a single batch."""
+    checker.submit_claim("Python was created by Guido van Rossum", SOURCE_URL)
+    checker.submit_claim("Python was first released in 1991", SOURCE_URL)
+
+    assert checker.resolve_pending_claims() == 2
+
+    for claim_id in ["claim_1", "claim_2"]:
+        claim = checker.get_claim(claim_id)
+        assert claim["is_resolved"] == True
+        assert claim["verdict"] == "true"
+    assert checker.get_claims_by_verdict("pending") == []
+    assert [c["id"] for c in checker.get_claims_by_verdict("true")] == ["claim_1", "claim_2"]
@@ -0,0 +1,43 @@
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "scripts"))
+
+from build_merkle_allowlist import build_allowlist, leaf_hash, verify_proof
+
+
+def addresses(n):
+    return ["0x" + f"{i + 1:040x}" for i in range(n)]
+
+
+class TestMerkleAllowlist(unittest.TestCase):
+    def test_every_member_proof_verifies(self):
+        for n in (1, 2, 3, 7, 64, 1000):
+            allowlist = build_allowlist(addresses(n))
+            root = bytes.fromhex(allowlist["root"][2:])
+            for address, proof in allowlist["proofs"].items():
+                proof_bytes = [bytes.fromhex(h[2:]) for h in proof]
+                self.assertTrue(verify_proof(root, leaf_hash(address), proof_bytes))
+
+    def test_proofs_are_logarithmic(self):
+        allowlist = build_allowlist(addresses(1000))
+        self.assertLessEqual(max(len(p) for p in allowlist["proofs"].values()), 10)
+
+    def test_non_member_is_rejected(self):
+        allowlist = build_allowlist(addresses(16))
+        root = bytes.fromhex(allowlist["root"][2:])
+        proof = [bytes.fromhex(h[2:]) for h in allowlist["proofs"][addresses(1)[0]]]
+        outsider = "0x" + "f" * 40
+        self.assertFalse(verify_proof(root, leaf_hash(outsider), proof))
+
+    def test_root_is_independent_of_input_order(self):
+        members = addresses(10)
+        self.assertEqual(
+            build_allowlist(members)["root"],
+            build_allowlist(list(reversed(members)))["root"],
+        )
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -4,6 +4,7 @@
 #
 # These tests deploy the price_feed.py example and verify
 # that prices can be fetched from web sources and stored on-chain.
+# tests/test_price_feed_direct.py covers the same flows offline.
 
 from gltest import get_contract_factory, default_account
 from gltest.helpers import load_fixture
@@ -51,6 +52,22 @@ def test_get_all_prices():
     assert len(prices) >= 1
 
 
+def test_update_prices_batch():
+    """Test updating several assets from one page in one transaction."""
+    contract = load_fixture(deploy_contract)
+
+    result = contract.update_prices(
+        args=[["Bitcoin", "Ethereum"], "https://www.coingecko.com/"],
+        wait_interval=10000,
+        wait_retries=15,
+    )
+    assert tx_execution_succeeded(result)
+
+    prices = contract.get_all_prices(args=[])
+    assets = {p["asset"] for p in prices}
+    assert "Bitcoin" in assets or "Ethereum" in assets
+
+
 def test_owner_remove():
     """Test that the owner can remove price entries."""
     contract = load_fixture(deploy_contract)
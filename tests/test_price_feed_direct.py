@@ -0,0 +1,69 @@
+# Test: Price Feed example contract, offline
+#
+# Run with: pytest tests/test_price_feed_direct.py (needs genlayer-test >= 0.29,
+# no Studio and no network)
+#
+# Runs price_feed.py in-process with the gltest direct-mode runner and serves
+# every web render and LLM call from tests/cassettes/price_feed.json. The
+# fixture holds a trimmed snapshot of the CoinGecko pages and the model's JSON
+# answers. A prompt change makes the replay raise CassetteMiss; re-record the
+# entry with GENLAYER_CASSETTE=record where gl.nondet reaches live services.
+
+import os
+import sys
+
+import pytest
+
+pytest.importorskip("gltest.direct")
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from genlayer_utils.cassette import Cassette
+
+ROOT = os.path.join(os.path.dirname(__file__), "..")
+CONTRACT = os.path.join(ROOT, "examples", "price_feed.py")
+CASSETTE = os.path.join(os.path.dirname(__file__), "cassettes", "price_feed.json")
+
+BITCOIN_URL = "https://www.coingecko.com/en/coins/bitcoin"
+MARKETS_URL = "https://www.coingecko.com/"
+
+
+@pytest.fixture
+def feed(direct_deploy):
+    contract = direct_deploy(CONTRACT)
+    # The SDK is imported by the deploy, so patch its gl namespace afterwards
+    import genlayer
+
+    with Cassette(CASSETTE).install(genlayer.gl):
+        yield contract
+
+
+def test_update_price(feed):
+    """Test fetching and storing a price, then skipping a refetch within the heartbeat."""
+    result = feed.update_price("Bitcoin", BITCOIN_URL)
+    assert result == {"fetched": True, "written": True, "reason": "first"}
+
+    price = feed.get_price("Bitcoin")
+    assert price["price"] == "67251.18"
+    assert price["currency"] == "USD"
+
+    result = feed.update_price("Bitcoin", BITCOIN_URL)
+    assert result == {"fetched": False, "written": False, "reason": "fresh"}
+
+
+def test_update_prices_batch(feed):
+    """Test updating several assets from one page and reading the snapshot."""
+    feed.update_prices(["Bitcoin", "Ethereum"], MARKETS_URL)
+
+    assert feed.get_all_prices() == [
+        {"asset": "Bitcoin", "price": "67251.18", "currency": "USD"},
+        {"asset": "Ethereum", "price": "3452.07", "currency": "USD"},
+    ]
+
+
+def test_owner_remove(feed):
+    """Test that removing a price also refreshes the snapshot."""
+    feed.update_price("Bitcoin", BITCOIN_URL)
+    feed.remove_price("Bitcoin")
+
+    assert feed.get_all_prices() == []